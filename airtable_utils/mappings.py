@@ -1,14 +1,22 @@
+import re
+import sys
+from functools import lru_cache
+
+_SPLIT_RE = re.compile(r"[-_\s]+")
+
 ACRONYM_TOKENS = {"APN", "HOA", "ID", "UI", "DNC", "LLC", "LP", "LLP", "INC", "CPA", "CEO", "CFO", "COO", "VP", "SQFT", "AOD"}
 
 
+@lru_cache(maxsize=4096)
 def to_title_case(field: str) -> str:
     """Convert snake_case field names to Title Case strings."""
     if not field:
         return field
 
-    parts = field.replace("-", " ").replace("_", " ").split()
     titled = []
-    for part in parts:
+    for part in _SPLIT_RE.split(field):
+        if not part:
+            continue
         upper = part.upper()
         if part.isnumeric():
             titled.append(part)
@@ -16,7 +24,7 @@ def to_title_case(field: str) -> str:
             titled.append(upper)
         else:
             titled.append(part.capitalize())
-    return " ".join(titled)
+    return sys.intern(" ".join(titled))
 
 
 # PROPERTY TABLE
@@ -271,6 +279,20 @@ FORECLOSURE_FIELDS = [
     "Trustee Phone Number",
     "Trustee Case Number",
 ]
+
+# Intern every canonical field name so equal keys share one string object, then
+# warm the title-case cache so records that already arrive title-cased resolve
+# with a single cache hit.
+for _group in (
+    PROPERTY_FIELDS, SELLER_FIELDS, MORTGAGE_FIELDS, COMPANY_FIELDS,
+    COMPANY_CONTACT_FIELDS, PHONE_FIELDS, EMAIL_FIELDS, AOD_FIELDS,
+    PROBATE_FIELDS, LIEN_FIELDS, FORECLOSURE_FIELDS,
+):
+    _group[:] = [sys.intern(_field) for _field in _group]
+    for _field in _group:
+        to_title_case(_field)
+del _group, _field
+
 # Export all field groups for cleaner imports
 __all__ = [
     "to_title_case",
@@ -42,6 +42,10 @@ def clean_record_data(data, valid_fields=None):
     if not data:
         return {}
     
+    # Hash lookups instead of scanning the field list for every key
+    if valid_fields is not None and not isinstance(valid_fields, (set, frozenset)):
+        valid_fields = frozenset(valid_fields)
+
     # Remove None values, empty strings, and invalid fields
     cleaned_data = {}
     for k, v in data.items():
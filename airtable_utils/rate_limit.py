@@ -0,0 +1,78 @@
+"""
+rate_limit.py
+Shared per-base request pacing for the Airtable uploaders.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import threading
+import time
+from typing import Dict, Mapping, Optional
+
+
+class TokenBucket:
+    """
+    Per-base pacing for Airtable's 5 requests/second limit. Bursts up to
+    `capacity` go straight through; beyond that each caller reserves the next
+    slot and sleeps until it, so sustained traffic never trips a 429.
+    """
+
+    __slots__ = ("rate", "capacity", "tokens", "last", "_lock")
+
+    def __init__(self, rate: float = 5.0, capacity: float = 5.0) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.last) * self.rate)
+            self.last = now
+            self.tokens -= 1
+            return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def acquire(self) -> None:
+        wait = self._reserve()
+        if wait:
+            time.sleep(wait)
+
+    async def acquire_async(self) -> None:
+        wait = self._reserve()
+        if wait:
+            await asyncio.sleep(wait)
+
+    def backoff(self, seconds: float) -> None:
+        """Push every caller back by `seconds` (e.g. a 429's Retry-After)."""
+        with self._lock:
+            self.tokens = min(self.tokens, -seconds * self.rate)
+
+
+_BUCKETS: Dict[str, TokenBucket] = {}
+
+
+def bucket_for(base_id: str) -> TokenBucket:
+    """The process-wide bucket for `base_id`, created on first use."""
+    if base_id not in _BUCKETS:
+        _BUCKETS.setdefault(base_id, TokenBucket())
+    return _BUCKETS[base_id]
+
+
+def status_retry_delay(status: int, headers: Mapping[str, str], attempt: int) -> Optional[float]:
+    """
+    Retry delay for an HTTP status, or None when it isn't retryable (only 429 and
+    5xx are). A server-provided Retry-After wins, otherwise full-jitter backoff.
+    """
+    if not (status == 429 or status >= 500):
+        return None
+    retry_after = headers.get("Retry-After")
+    if retry_after:
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            pass
+    return random.uniform(0, min(8, 2 ** attempt))
@@ -6,16 +6,39 @@
 
 from __future__ import annotations
 
+import asyncio
+import atexit
+import importlib.util
 import json
 import os
+import queue
+import random
+import sys
+import threading
 import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+from urllib.parse import quote
 
 import requests
-from pyairtable import Table
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from pyairtable import Api, Table
+from pyairtable.api.retrying import retry_strategy
 from dotenv import load_dotenv
 
+try:
+    import orjson
+except ImportError:  # optional: faster JSON encode/decode when installed
+    orjson = None
+
+try:
+    import httpx
+except ImportError:  # optional: only needed for batch_upload_async
+    httpx = None
+
 # === Load env ===
 load_dotenv()
 AIRTABLE_API_KEY = os.getenv("AIRTABLE_API_KEY")
@@ -26,6 +49,7 @@ if not AIRTABLE_API_KEY:
 
 # === Field mappings (import your canonical schemas) ===
 # Ensure these come from your central mappings.py
+from airtable_utils.rate_limit import TokenBucket, bucket_for, status_retry_delay
 from airtable_utils.mappings import (
     PROPERTY_FIELDS,
     SELLER_FIELDS,
@@ -46,22 +70,96 @@ LOG_DIR = Path("logs")
 LOG_DIR.mkdir(exist_ok=True)
 LOG_PATH = LOG_DIR / f"uploads_{time.strftime('%Y%m%d_%H%M%S')}.log"
 
+# Log lines are written by a background thread that owns one file handle, so the
+# upload loop never pays an open()/close() per line.
+_LOG_Q: "queue.Queue[Any]" = queue.Queue()
+_LOG_STOP = object()
 
-def _log(line: str) -> None:
-    print(line)
+
+def _drain_log_queue() -> None:
     try:
-        with LOG_PATH.open("a", encoding="utf-8") as f:
-            f.write(line + "\n")
+        handle = LOG_PATH.open("a", encoding="utf-8")
     except Exception:
         # Don't crash the pipeline due to logging failures
-        pass
+        return
+    with handle:
+        unflushed = 0
+        last_flush = time.monotonic()
+        while True:
+            try:
+                line = _LOG_Q.get(timeout=1.0)
+            except queue.Empty:
+                line = None
+            if line is _LOG_STOP:
+                break
+            try:
+                if line is not None:
+                    handle.write(line + "\n")
+                    unflushed += 1
+                if unflushed and (unflushed >= 100 or time.monotonic() - last_flush >= 1.0):
+                    handle.flush()
+                    unflushed = 0
+                    last_flush = time.monotonic()
+            except Exception:
+                pass
+
+
+def _stop_log_writer() -> None:
+    _LOG_Q.put(_LOG_STOP)
+    _LOG_THREAD.join(timeout=5)
+
+
+_LOG_THREAD = threading.Thread(target=_drain_log_queue, name="router-log-writer", daemon=True)
+_LOG_THREAD.start()
+atexit.register(_stop_log_writer)
+
+
+def _log(line: str) -> None:
+    print(line)
+    _LOG_Q.put(line)
+
+
+# === JSON ===
+def _json_dumps(obj: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode("utf-8")
+
+
+def _json_loads(raw: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+# === HTTP ===
+# One pooled session for Slack + Meta API calls so connections stay warm.
+# Auth is passed per request: the session is shared with the Slack webhook.
+_HTTP = requests.Session()
+_HTTP.mount("https://", HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=Retry(total=0)))
+_AIRTABLE_HEADERS = {"Authorization": f"Bearer {AIRTABLE_API_KEY}"}
+# One Api (hence one keep-alive session) behind every pyairtable Table, instead of
+# a session per table. 429s are left to the per-base token bucket, and record
+# creates (POST) to _batch_create_with_retries: the transport only retries 5xx
+# on idempotent methods, so a create is never re-sent behind the app's back.
+_AIRTABLE_RETRY = retry_strategy(
+    total=3,
+    backoff_factor=0.3,
+    status_forcelist=(500, 502, 503, 504),
+    allowed_methods=Retry.DEFAULT_ALLOWED_METHODS,
+)
+_AIRTABLE_API = Api(AIRTABLE_API_KEY, retry_strategy=None)
+_AIRTABLE_API.session.mount(
+    "https://", HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=_AIRTABLE_RETRY)
+)
+_JSON_HEADERS = {"Content-Type": "application/json"}
 
 
 def _slack_post(payload: Dict[str, Any]) -> None:
     if not SLACK_WEBHOOK_URL:
         return
     try:
-        requests.post(SLACK_WEBHOOK_URL, json=payload, timeout=6)
+        _HTTP.post(SLACK_WEBHOOK_URL, data=_json_dumps(payload), headers=_JSON_HEADERS, timeout=6)
     except Exception as exc:
         _log(f"⚠️ Slack post failed: {exc}")
 
@@ -112,38 +210,91 @@ TABLE_FIELD_GROUPS: Dict[str, List[str]] = {
     # "Vacant" has no explicit schema from your mapping; it’ll rely on live schema
 }
 
+# Canonical field sets, frozen once at import and shared by routing, schema
+# fallbacks and callers that need membership checks.
+TABLE_FIELD_SETS: Dict[str, frozenset] = {
+    name: frozenset(sys.intern(f) for f in fields) for name, fields in TABLE_FIELD_GROUPS.items()
+}
+
+# Inverted index (field -> tables containing it), built once so routing a record
+# costs one dict lookup per key instead of a set intersection per table.
+_TABLE_ORDER: Dict[str, int] = {name: idx for idx, name in enumerate(TABLE_FIELD_GROUPS)}
+_FIELD_TO_TABLES: Dict[str, Tuple[str, ...]] = {}
+for _name, _fields in TABLE_FIELD_SETS.items():
+    for _field in _fields:
+        _FIELD_TO_TABLES[_field] = _FIELD_TO_TABLES.get(_field, ()) + (_name,)
+del _name, _fields, _field
+
+# High-specificity fields that only ever belong to one table. A record carrying
+# one of these whose other keys all fit that table is routed without scoring.
+# ("Deceased Or Estate"/"Survivor Or Heir" are shared by Probate and Liens, so
+# they can't be hints.)
+_UNIQUE_FIELD_HINTS: Dict[str, str] = {
+    "Default Date": "Foreclosure",
+    "Auction Date": "Foreclosure",
+    "Date Of Death": "AOD",
+    "Email Deliverability": "Email Addresses",
+    "Carrier": "Phone Numbers",
+}
+assert all(_FIELD_TO_TABLES.get(f) == (t,) for f, t in _UNIQUE_FIELD_HINTS.items())
+
+# One upload at a time per base (Airtable rate-limits per base); different bases
+# upload in parallel.
+_BASE_LOCKS: Dict[str, threading.Semaphore] = {
+    meta["base_id"]: threading.Semaphore(1) for meta in BASE_MAP.values()
+}
+
+# Full buckets batch_upload may hold per base before routing waits for uploads
+BATCH_QUEUE_DEPTH = 4
+
 # === Caches ===
 _CLIENT_CACHE: Dict[Tuple[str, str], Table] = {}
-_SCHEMA_CACHE: Dict[Tuple[str, str], List[str]] = {}
+# (base_id, table_name) -> (expires_at, fields, field set); expiry is time.monotonic()
+_SCHEMA_CACHE: Dict[Tuple[str, str], Tuple[float, List[str], frozenset]] = {}
+SCHEMA_TTL_SECONDS = 3600.0
+SCHEMA_FAILURE_TTL_SECONDS = 30.0
 
 
 def _get_table(base_id: str, table_name: str) -> Table:
     key = (base_id, table_name)
     if key not in _CLIENT_CACHE:
-        _CLIENT_CACHE[key] = Table(AIRTABLE_API_KEY, base_id, table_name)
+        _CLIENT_CACHE[key] = _AIRTABLE_API.table(base_id, table_name)
     return _CLIENT_CACHE[key]
 
 
-def _fetch_live_schema(base_id: str, table_name: str) -> List[str]:
+def _cache_schema(
+    cache_key: Tuple[str, str],
+    fields: List[str],
+    ttl: float,
+    field_set: Optional[frozenset] = None,
+) -> Tuple[float, List[str], frozenset]:
+    entry = (time.monotonic() + ttl, fields, field_set if field_set is not None else frozenset(fields))
+    _SCHEMA_CACHE[cache_key] = entry
+    return entry
+
+
+def _schema_entry(base_id: str, table_name: str) -> Tuple[float, List[str], frozenset]:
     """
     Pull the live schema from Airtable Meta API. Fallback to known schema map.
+    Live schemas are cached for SCHEMA_TTL_SECONDS; a fallback after a failed
+    fetch only for SCHEMA_FAILURE_TTL_SECONDS, so transient errors retry soon
+    without hitting the Meta API once per record in between.
     """
     cache_key = (base_id, table_name)
-    if cache_key in _SCHEMA_CACHE:
-        return _SCHEMA_CACHE[cache_key]
+    entry = _SCHEMA_CACHE.get(cache_key)
+    if entry is not None and time.monotonic() < entry[0]:
+        return entry
 
     url = f"https://api.airtable.com/v0/meta/bases/{base_id}/tables"
-    headers = {"Authorization": f"Bearer {AIRTABLE_API_KEY}"}
     try:
-        resp = requests.get(url, headers=headers, timeout=10)
+        resp = _HTTP.get(url, headers=_AIRTABLE_HEADERS, timeout=10)
         if resp.status_code == 200:
-            meta = resp.json()
+            meta = _json_loads(resp.content)
             for t in meta.get("tables", []):
                 if t.get("name") == table_name:
-                    fields = [f.get("name") for f in t.get("fields", []) if f.get("name")]
+                    fields = [sys.intern(f["name"]) for f in t.get("fields", []) if f.get("name")]
                     if fields:
-                        _SCHEMA_CACHE[cache_key] = fields
-                        return fields
+                        return _cache_schema(cache_key, fields, SCHEMA_TTL_SECONDS)
         else:
             _log(f"⚠️ Meta API {base_id}/{table_name} returned {resp.status_code}: {resp.text[:200]}")
     except Exception as exc:
@@ -151,65 +302,112 @@ def _fetch_live_schema(base_id: str, table_name: str) -> List[str]:
 
     # fallback to canonical mapping if available
     fallback = TABLE_FIELD_GROUPS.get(table_name, [])
-    _SCHEMA_CACHE[cache_key] = list(fallback)
-    return _SCHEMA_CACHE[cache_key]
+    return _cache_schema(
+        cache_key, list(fallback), SCHEMA_FAILURE_TTL_SECONDS, TABLE_FIELD_SETS.get(table_name, frozenset())
+    )
 
 
-def _clean_record_keys(record: Mapping[str, Any]) -> Dict[str, Any]:
+def _fetch_live_schema(base_id: str, table_name: str) -> List[str]:
+    return _schema_entry(base_id, table_name)[1]
+
+
+def _fetch_schema_set(base_id: str, table_name: str) -> frozenset:
     """
-    Title-case keys and drop null/empty values.
+    Same as _fetch_live_schema, but as a frozenset for O(1) membership checks.
+    """
+    return _schema_entry(base_id, table_name)[2]
+
+
+def _clean_record_keys(record: Mapping[str, Any], keep: Optional[frozenset] = None) -> Dict[str, Any]:
+    """
+    Title-case keys and drop null/empty values. When `keep` is given, keys whose
+    title-cased form isn't in it are dropped as well.
     """
     clean: Dict[str, Any] = {}
     for k, v in (record or {}).items():
-        if v in (None, ""):
+        if v is None or v == "":
+            continue
+        key = to_title_case(str(k))
+        if keep is not None and key not in keep:
             continue
-        clean[to_title_case(str(k))] = v
+        clean[key] = v
     return clean
 
 
-def _subset_to_schema(record: Mapping[str, Any], fields: List[str]) -> Dict[str, Any]:
-    if not fields:
+def _keep_fields(tables: List[str]) -> Optional[frozenset]:
+    """
+    Union of the live schemas for forced target tables, or None when any of them
+    accepts every field (no known schema) or none of them is a known table, so
+    nothing is dropped up front and routing reports the unknown table itself.
+    """
+    keep: Optional[frozenset] = None
+    for table_name in tables:
+        meta = BASE_MAP.get(table_name)
+        if not meta:
+            continue
+        fields = _fetch_schema_set(meta["base_id"], meta["table_name"])
+        if not fields:
+            return None
+        keep = fields if keep is None else keep | fields
+    return keep
+
+
+def _subset_to_schema(record: Mapping[str, Any], allowed: frozenset) -> Dict[str, Any]:
+    if not allowed:
         # if no known fields (e.g., Vacant, or temp table), pass everything
         return dict(record)
-    allowed = set(fields)
     return {k: v for k, v in record.items() if k in allowed}
 
 
-def _create_with_retries(table: Table, fields: Dict[str, Any], max_attempts: int = 3) -> bool:
+def _create_with_retries(
+    table: Table, fields: Dict[str, Any], max_attempts: int = 3, base_id: Optional[str] = None
+) -> bool:
     """
-    Create a single record with exponential backoff on 429s and transient errors.
+    Create a single record. Goes through batch_create so single-record uploads
+    share the exact HTTP path (and retry policy) of batched ones.
     """
-    for attempt in range(1, max_attempts + 1):
-        try:
-            table.create(fields)
-            return True
-        except Exception as exc:
-            msg = str(exc)
-            is_rate = "429" in msg or "Rate" in msg or "Too Many Requests" in msg
-            _log(f"⚠️ create failed (attempt {attempt}/{max_attempts}): {msg}")
-            if attempt < max_attempts and (is_rate or True):
-                time.sleep(min(8, 2 ** attempt))
-                continue
-            return False
+    return _batch_create_with_retries(table, [fields], max_attempts=max_attempts, base_id=base_id)
 
 
-def _batch_create_with_retries(table: Table, batch: List[Dict[str, Any]], max_attempts: int = 3) -> bool:
+def _retry_delay(exc: Exception, attempt: int) -> Optional[float]:
+    """
+    Seconds to wait before retrying after `exc`, or None when the error is not
+    worth retrying. Only 429s, 5xx and timeouts/connection drops are retried.
     """
-    Batch create (up to Airtable’s limits) with retries.
+    if isinstance(exc, (requests.Timeout, requests.ConnectionError)):
+        return random.uniform(0, min(8, 2 ** attempt))
+    response = getattr(exc, "response", None)
+    status = getattr(response, "status_code", None)
+    if status is None:
+        return None
+    return status_retry_delay(status, response.headers, attempt)
+
+
+def _batch_create_with_retries(
+    table: Table, batch: List[Dict[str, Any]], max_attempts: int = 3, base_id: Optional[str] = None
+) -> bool:
     """
-    payload = [{"fields": rec} for rec in batch]
+    Batch create (up to Airtable’s limits) with retries. With `base_id`, each
+    attempt waits on that base's token bucket, and a 429 holds the whole base back.
+    """
+    bucket = bucket_for(base_id) if base_id else None
     for attempt in range(1, max_attempts + 1):
+        if bucket is not None:
+            bucket.acquire()
         try:
-            table.batch_create(payload)
+            # batch_create wraps each row in {"fields": ...} itself
+            table.batch_create(batch)
             return True
         except Exception as exc:
-            msg = str(exc)
-            is_rate = "429" in msg or "Rate" in msg or "Too Many Requests" in msg
-            _log(f"⚠️ batch_create failed (attempt {attempt}/{max_attempts}): {msg}")
-            if attempt < max_attempts and (is_rate or True):
-                time.sleep(min(8, 2 ** attempt))
-                continue
-            return False
+            _log(f"⚠️ batch_create failed (attempt {attempt}/{max_attempts}): {exc}")
+            delay = _retry_delay(exc, attempt) if attempt < max_attempts else None
+            if delay is None:
+                return False
+            if bucket is not None and getattr(getattr(exc, "response", None), "status_code", None) == 429:
+                bucket.backoff(delay)
+            else:
+                time.sleep(delay)
+    return False
 
 
 def _detect_target_tables(cleaned: Mapping[str, Any]) -> List[str]:
@@ -218,163 +416,207 @@ def _detect_target_tables(cleaned: Mapping[str, Any]) -> List[str]:
     with canonical schemas. If none match, default to Properties when there is a
     'Property Address' or 'Full Address'.
     """
-    keys = set(cleaned.keys())
-    hits: List[Tuple[str, int]] = []
-
-    for table_name, fields in TABLE_FIELD_GROUPS.items():
-        overlap = len(keys.intersection(set(fields)))
-        if overlap > 0:
-            hits.append((table_name, overlap))
-
-    # Sort by strongest schema match (more overlapping fields first)
-    hits.sort(key=lambda x: x[1], reverse=True)
-    targets = [t for t, _ in hits]
+    # Fast path: a unique-field hint and no key that belongs to another table
+    for field, table_name in _UNIQUE_FIELD_HINTS.items():
+        if field in cleaned:
+            only = (table_name,)
+            if all(_FIELD_TO_TABLES.get(key, only) == only for key in cleaned):
+                return [table_name]
+            break
+
+    counts: Counter = Counter()
+    for key in cleaned:
+        for table_name in _FIELD_TO_TABLES.get(key, ()):
+            counts[table_name] += 1
+
+    # Sort by strongest schema match (more overlapping fields first); ties keep
+    # the TABLE_FIELD_GROUPS declaration order.
+    targets = sorted(counts, key=lambda t: (-counts[t], _TABLE_ORDER[t]))
 
     if not targets:
         # heuristic fallback
-        if any(k in keys for k in ("Property Address", "Full Address", "Street Address")):
+        if any(k in cleaned for k in ("Property Address", "Full Address", "Street Address")):
             targets = ["Properties"]
 
     return targets
 
 
-def route_and_upload(
+def _route_record(
     record: Mapping[str, Any],
-    *,
-    prefer_tables: Optional[List[str]] = None,
-    batch_mode: bool = False,
-) -> Dict[str, bool]:
+    prefer_tables: Optional[List[str]],
+    results: Optional[Dict[str, bool]],
+) -> Tuple[int, int]:
     """
-    Route a single record to the appropriate base(s)/table(s).
-    Returns per-table success booleans.
+    Shared single-record routing. Returns (uploaded, failed) table counts and,
+    when `results` is given, also records per-table success booleans in it.
     """
     if not isinstance(record, Mapping):
         _log("⚠️ route_and_upload: record is not a mapping; skipped")
-        return {}
+        return 0, 0
 
-    cleaned = _clean_record_keys(record)
+    cleaned = _clean_record_keys(record, _keep_fields(prefer_tables) if prefer_tables else None)
     if not cleaned:
         _log("⚠️ route_and_upload: empty/invalid record after cleaning; skipped")
-        return {}
+        return 0, 0
 
     # Pick targets
     targets = prefer_tables or _detect_target_tables(cleaned)
     if not targets:
         _log("ℹ️ No matching table for record; skipped")
-        return {}
+        return 0, 0
 
-    results: Dict[str, bool] = {}
+    uploaded = failed = 0
 
     for table_name in targets:
         meta = BASE_MAP.get(table_name)
         if not meta:
             _log(f"⚠️ Unknown table in BASE_MAP: {table_name} — skipping")
-            results[table_name] = False
+            failed += 1
+            if results is not None:
+                results[table_name] = False
             continue
 
         base_id = meta["base_id"]
         real_table = meta["table_name"]
         table = _get_table(base_id, real_table)
-        live_fields = _fetch_live_schema(base_id, real_table)
+        live_fields = _fetch_schema_set(base_id, real_table)
 
         subset = _subset_to_schema(cleaned, live_fields)
         if not subset:
             _log(f"ℹ️ Record has no valid fields for {table_name}; skipping")
-            results[table_name] = False
+            failed += 1
+            if results is not None:
+                results[table_name] = False
             continue
 
         pretty = subset.get("Full Address") or subset.get("Property Address") or subset.get("Company Name") or "(no key)"
         _log(f"📦 Upload → [{table_name}] {pretty}")
 
-        ok = _create_with_retries(table, subset)
-        results[table_name] = ok
+        ok = _create_with_retries(table, subset, base_id=base_id)
+        if results is not None:
+            results[table_name] = ok
         if ok:
+            uploaded += 1
             _log(f"✅ Uploaded → [{table_name}] {pretty}")
         else:
+            failed += 1
             _log(f"❌ Upload failed → [{table_name}] {pretty}")
 
+    return uploaded, failed
+
+
+def route_and_upload(
+    record: Mapping[str, Any],
+    *,
+    prefer_tables: Optional[List[str]] = None,
+    batch_mode: bool = False,
+) -> Dict[str, bool]:
+    """
+    Route a single record to the appropriate base(s)/table(s).
+    Returns per-table success booleans.
+    """
+    results: Dict[str, bool] = {}
+    _route_record(record, prefer_tables, results)
     return results
 
 
-def batch_upload(
-    records: Iterable[Mapping[str, Any]],
+def route_and_upload_fast(
+    record: Mapping[str, Any],
     *,
-    batch_size: int = 10,
-    hard_batch: bool = False,
     prefer_tables: Optional[List[str]] = None,
-) -> Dict[str, int]:
+) -> Tuple[int, int]:
     """
-    Batch upload with routing. Two modes:
-      - hard_batch=True: group by table and use batch_create for each group
-      - hard_batch=False (default): per-record route_and_upload (safer if schemas vary)
-    Returns summary counts.
+    Same routing as route_and_upload, but returns (uploaded, failed) table counts
+    instead of building a per-table dict.
     """
-    materialized = [r for r in (records or []) if isinstance(r, Mapping)]
-    if not materialized:
-        _log("ℹ️ No records provided to batch_upload.")
-        return {"total": 0, "uploaded": 0, "failed": 0, "skipped": 0}
+    return _route_record(record, prefer_tables, None)
+
+
+def _upload_table_rows(
+    table_name: str, rows: List[Tuple[int, Dict[str, Any]]], batch_size: int
+) -> List[Tuple[int, bool]]:
+    """
+    Upload one table's (record index, row) pairs in chunks, holding that base's
+    lock so calls to the same base stay serialized. Returns (record index, ok)
+    for every row.
+    """
+    meta = BASE_MAP[table_name]
+    base_id = meta["base_id"]
+    real_table = meta["table_name"]
+    table = _get_table(base_id, real_table)
+    outcomes: List[Tuple[int, bool]] = []
 
-    total = len(materialized)
-    uploaded = failed = skipped = 0
-
-    if not hard_batch:
-        for idx, rec in enumerate(materialized, 1):
-            res = route_and_upload(rec, prefer_tables=prefer_tables)
-            if not res:
-                skipped += 1
-                continue
-            # Count success/fail for this record as a single unit:
-            if any(res.values()):
-                uploaded += 1
+    with _BASE_LOCKS[base_id]:
+        for i in range(0, len(rows), batch_size):
+            chunk = rows[i:i + batch_size]
+            ok = _batch_create_with_retries(table, [row for _, row in chunk], base_id=base_id)
+            if ok:
+                _log(f"✅ Batch → [{table_name}] +{len(chunk)}")
             else:
-                failed += 1
-        summary = {"total": total, "uploaded": uploaded, "failed": failed, "skipped": skipped}
-        _log(f"📊 Batch summary: {summary}")
-        if uploaded:
-            slack_info(f"Batch upload complete: {uploaded}/{total} records uploaded")
-        elif failed:
-            slack_warn(f"Batch upload completed with failures: {failed}/{total} failed")
-        return summary
-
-    # hard_batch mode: route to buckets by table and use batch_create
-    # Build per-table buckets (use live schema for filtering)
-    buckets: Dict[str, List[Dict[str, Any]]] = {}
-
-    for rec in materialized:
-        cleaned = _clean_record_keys(rec)
+                _log(f"❌ Batch failed → [{table_name}] ({len(chunk)})")
+            outcomes.extend((idx, ok) for idx, _ in chunk)
+
+    return outcomes
+
+
+def _iter_routed_rows(
+    records: Iterable[Mapping[str, Any]],
+    prefer_tables: Optional[List[str]],
+    counts: Dict[str, int],
+) -> Iterator[Tuple[int, str, Dict[str, Any]]]:
+    """
+    Stream (record index, table_name, schema-filtered row) triples for a batch,
+    counting records into counts["total"] / counts["skipped"] as they are consumed.
+    """
+    # Resolved once per target table for the whole batch; filled lazily so
+    # tables no record routes to never trigger a schema fetch.
+    target_schemas: Dict[str, frozenset] = {}
+    keep = _keep_fields(prefer_tables) if prefer_tables else None
+
+    for idx, rec in enumerate(records or ()):
+        if not isinstance(rec, Mapping):
+            continue
+        counts["total"] += 1
+        cleaned = _clean_record_keys(rec, keep)
+        if not cleaned:
+            counts["skipped"] += 1
+            continue
         targets = prefer_tables or _detect_target_tables(cleaned)
         if not targets:
-            skipped += 1
+            counts["skipped"] += 1
             continue
         for table_name in targets:
-            meta = BASE_MAP.get(table_name)
-            if not meta:
-                continue
-            base_id = meta["base_id"]
-            real_table = meta["table_name"]
-            live_fields = _fetch_live_schema(base_id, real_table)
+            live_fields = target_schemas.get(table_name)
+            if live_fields is None:
+                meta = BASE_MAP.get(table_name)
+                if not meta:
+                    continue
+                live_fields = _fetch_schema_set(meta["base_id"], meta["table_name"])
+                target_schemas[table_name] = live_fields
             subset = _subset_to_schema(cleaned, live_fields)
             if subset:
-                buckets.setdefault(table_name, []).append(subset)
+                yield idx, table_name, subset
 
-    for table_name, rows in buckets.items():
-        meta = BASE_MAP[table_name]
-        base_id = meta["base_id"]
-        real_table = meta["table_name"]
-        table = _get_table(base_id, real_table)
 
-        # chunk
-        for i in range(0, len(rows), batch_size):
-            chunk = rows[i:i + batch_size]
-            ok = _batch_create_with_retries(table, chunk)
-            if ok:
-                uploaded += len(chunk)
-                _log(f"✅ Batch → [{table_name}] +{len(chunk)}")
-            else:
-                failed += len(chunk)
-                _log(f"❌ Batch failed → [{table_name}] ({len(chunk)})")
+def _count_records(counts: Dict[str, int], outcomes: Iterable[Tuple[int, bool]]) -> None:
+    """
+    Fold per-row (record index, ok) outcomes into per-record counts: a record
+    routed to several tables is uploaded once if any of its rows landed.
+    """
+    landed: Dict[int, bool] = {}
+    for idx, ok in outcomes:
+        landed[idx] = landed.get(idx, False) or ok
+    counts["uploaded"] = sum(landed.values())
+    counts["failed"] = len(landed) - counts["uploaded"]
+
+
+def _batch_summary(counts: Dict[str, int]) -> Dict[str, int]:
+    total, uploaded, failed = counts["total"], counts["uploaded"], counts["failed"]
+    if not total:
+        _log("ℹ️ No records provided to batch_upload.")
+        return {"total": 0, "uploaded": 0, "failed": 0, "skipped": 0}
 
-    summary = {"total": total, "uploaded": uploaded, "failed": failed, "skipped": skipped}
+    summary = {"total": total, "uploaded": uploaded, "failed": failed, "skipped": counts["skipped"]}
     _log(f"📊 Batch summary: {summary}")
     if uploaded:
         slack_info(f"Batch upload complete: {uploaded}/{total} records uploaded")
@@ -383,66 +625,289 @@ def batch_upload(
     return summary
 
 
+def batch_upload(
+    records: Iterable[Mapping[str, Any]],
+    *,
+    batch_size: int = 10,
+    hard_batch: bool = False,
+    prefer_tables: Optional[List[str]] = None,
+) -> Dict[str, int]:
+    """
+    Batch upload with routing. Records are streamed once: each is cleaned, routed
+    and appended to its table's bucket, and a full bucket (`batch_size` rows;
+    Airtable accepts 10 per POST) goes onto its base's bounded queue. One
+    consumer thread per base drains that queue, so bases upload in parallel and
+    a slow base makes routing wait instead of buffering the whole input.
+    `hard_batch` is kept for backwards compatibility; every upload is batched now.
+    Returns summary counts.
+    """
+    counts = {"total": 0, "uploaded": 0, "failed": 0, "skipped": 0}
+    outcomes: List[Tuple[int, bool]] = []
+    outcomes_lock = threading.Lock()
+
+    # Route to buckets by table (use live schema for filtering)
+    buckets: Dict[str, List[Tuple[int, Dict[str, Any]]]] = {}
+    base_queues: Dict[str, "queue.Queue[Optional[Tuple[str, List[Tuple[int, Dict[str, Any]]]]]]"] = {}
+    consumers: List[threading.Thread] = []
+
+    def _consume(base_q: "queue.Queue[Optional[Tuple[str, List[Tuple[int, Dict[str, Any]]]]]]") -> None:
+        while True:
+            item = base_q.get()
+            if item is None:
+                return
+            table_name, rows = item
+            try:
+                results = _upload_table_rows(table_name, rows, batch_size)
+            except Exception as exc:
+                _log(f"❌ Batch error → [{table_name}] ({len(rows)}): {exc}")
+                results = [(idx, False) for idx, _ in rows]
+            with outcomes_lock:
+                outcomes.extend(results)
+
+    def _flush(table_name: str, rows: List[Tuple[int, Dict[str, Any]]]) -> None:
+        base_id = BASE_MAP[table_name]["base_id"]
+        base_q = base_queues.get(base_id)
+        if base_q is None:
+            base_q = base_queues[base_id] = queue.Queue(maxsize=BATCH_QUEUE_DEPTH)
+            consumer = threading.Thread(target=_consume, args=(base_q,), daemon=True)
+            consumer.start()
+            consumers.append(consumer)
+        base_q.put((table_name, rows))  # blocks while this base is BATCH_QUEUE_DEPTH behind
+
+    try:
+        for idx, table_name, row in _iter_routed_rows(records, prefer_tables, counts):
+            bucket = buckets.setdefault(table_name, [])
+            bucket.append((idx, row))
+            if len(bucket) >= batch_size:
+                _flush(table_name, bucket)
+                buckets[table_name] = []
+
+        # Flush remainders
+        for table_name, bucket in buckets.items():
+            if bucket:
+                _flush(table_name, bucket)
+    finally:
+        for base_q in base_queues.values():
+            base_q.put(None)
+        for consumer in consumers:
+            consumer.join()
+
+    _count_records(counts, outcomes)
+    return _batch_summary(counts)
+
+
+def route_and_upload_batch(
+    records: Iterable[Mapping[str, Any]],
+    *,
+    batch_size: int = 10,
+    prefer_tables: Optional[List[str]] = None,
+) -> List[Dict[str, bool]]:
+    """
+    Per-record results of route_and_upload, at batch_upload's request count:
+    rows are sent `batch_size` per POST, and each record's entry maps every
+    table it was routed to onto that POST's success. Entries follow input order.
+    """
+    records = list(records or ())
+    results: List[Dict[str, bool]] = [{} for _ in records]
+    counts = {"total": 0, "uploaded": 0, "failed": 0, "skipped": 0}
+    pending: Dict[str, List[Tuple[int, Dict[str, Any]]]] = {}
+
+    def flush(table_name: str) -> None:
+        chunk = pending.pop(table_name, [])
+        if not chunk:
+            return
+        meta = BASE_MAP[table_name]
+        table = _get_table(meta["base_id"], meta["table_name"])
+        ok = _batch_create_with_retries(table, [row for _, row in chunk], base_id=meta["base_id"])
+        _log(f"{'✅' if ok else '❌'} Batch → [{table_name}] {len(chunk)}")
+        for idx, _ in chunk:
+            results[idx][table_name] = ok
+
+    for idx, table_name, row in _iter_routed_rows(records, prefer_tables, counts):
+        chunk = pending.setdefault(table_name, [])
+        chunk.append((idx, row))
+        if len(chunk) >= batch_size:
+            flush(table_name)
+    for table_name in list(pending):
+        flush(table_name)
+
+    return results
+
+
+# ---------- Async batch upload (httpx) ----------
+
+# HTTP/2 lets concurrent batch POSTs share one connection; needs the h2 extra.
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+ASYNC_PER_BASE_CONCURRENCY = 5
+
+
+async def _post_rows_async(
+    client: Any, url: str, rows: List[Dict[str, Any]], max_attempts: int = 3, bucket: Optional[TokenBucket] = None
+) -> bool:
+    """
+    Async twin of _batch_create_with_retries: one records POST, same retry policy.
+    """
+    body = _json_dumps({"records": [{"fields": rec} for rec in rows], "typecast": False})
+    for attempt in range(1, max_attempts + 1):
+        delay: Optional[float]
+        throttled = False
+        if bucket is not None:
+            await bucket.acquire_async()
+        try:
+            resp = await client.post(url, content=body, headers=_JSON_HEADERS)
+        except httpx.TransportError as exc:
+            _log(f"⚠️ batch_create failed (attempt {attempt}/{max_attempts}): {exc!r}")
+            delay = random.uniform(0, min(8, 2 ** attempt))
+        else:
+            if resp.status_code == 200:
+                return True
+            _log(f"⚠️ batch_create failed (attempt {attempt}/{max_attempts}): {resp.status_code} {resp.text[:200]}")
+            delay = status_retry_delay(resp.status_code, resp.headers, attempt)
+            throttled = resp.status_code == 429
+        if delay is None or attempt == max_attempts:
+            return False
+        if bucket is not None and throttled:
+            bucket.backoff(delay)
+            continue
+        await asyncio.sleep(delay)
+    return False
+
+
+async def _upload_table_rows_async(
+    client: Any,
+    limits: Dict[str, asyncio.Semaphore],
+    table_name: str,
+    rows: List[Tuple[int, Dict[str, Any]]],
+    batch_size: int,
+) -> List[Tuple[int, bool]]:
+    meta = BASE_MAP[table_name]
+    base_id = meta["base_id"]
+    url = f"https://api.airtable.com/v0/{base_id}/{quote(meta['table_name'], safe='')}"
+
+    async def send(chunk: List[Tuple[int, Dict[str, Any]]]) -> List[Tuple[int, bool]]:
+        async with limits[base_id]:
+            ok = await _post_rows_async(client, url, [row for _, row in chunk], bucket=bucket_for(base_id))
+        if ok:
+            _log(f"✅ Batch → [{table_name}] +{len(chunk)}")
+        else:
+            _log(f"❌ Batch failed → [{table_name}] ({len(chunk)})")
+        return [(idx, ok) for idx, _ in chunk]
+
+    results = await asyncio.gather(*(send(rows[i:i + batch_size]) for i in range(0, len(rows), batch_size)))
+    return [outcome for chunk_outcomes in results for outcome in chunk_outcomes]
+
+
+async def batch_upload_async(
+    records: Iterable[Mapping[str, Any]],
+    *,
+    batch_size: int = 10,
+    prefer_tables: Optional[List[str]] = None,
+) -> Dict[str, int]:
+    """
+    Async variant of batch_upload over a single httpx.AsyncClient (HTTP/2 when
+    h2 is installed). Routing and filtering are identical; chunks for all
+    tables are sent concurrently, at most ASYNC_PER_BASE_CONCURRENCY per base.
+    Returns the same summary counts.
+    """
+    if httpx is None:
+        raise RuntimeError("batch_upload_async requires httpx (pip install 'httpx[http2]')")
+
+    counts = {"total": 0, "uploaded": 0, "failed": 0, "skipped": 0}
+    buckets: Dict[str, List[Tuple[int, Dict[str, Any]]]] = {}
+    for idx, table_name, row in _iter_routed_rows(records, prefer_tables, counts):
+        buckets.setdefault(table_name, []).append((idx, row))
+
+    if buckets:
+        limits = {
+            meta["base_id"]: asyncio.Semaphore(ASYNC_PER_BASE_CONCURRENCY) for meta in BASE_MAP.values()
+        }
+        async with httpx.AsyncClient(http2=_HTTP2_AVAILABLE, headers=_AIRTABLE_HEADERS, timeout=30) as client:
+            results = await asyncio.gather(*(
+                _upload_table_rows_async(client, limits, table_name, rows, batch_size)
+                for table_name, rows in buckets.items()
+            ))
+        _count_records(counts, (outcome for table_outcomes in results for outcome in table_outcomes))
+
+    return _batch_summary(counts)
+
+
 # ---------- Convenience helpers ----------
 
 def upload_property(record: Mapping[str, Any]) -> bool:
     """
     Force route to Properties only (useful when you are sure of target)
     """
-    res = route_and_upload(record, prefer_tables=["Properties"])
-    return bool(res.get("Properties"))
+    ok, _ = route_and_upload_fast(record, prefer_tables=["Properties"])
+    return ok > 0
 
 
 def upload_seller(record: Mapping[str, Any]) -> bool:
-    res = route_and_upload(record, prefer_tables=["Sellers"])
-    return bool(res.get("Sellers"))
+    ok, _ = route_and_upload_fast(record, prefer_tables=["Sellers"])
+    return ok > 0
 
 
 def upload_company(record: Mapping[str, Any]) -> bool:
-    res = route_and_upload(record, prefer_tables=["Companies"])
-    return bool(res.get("Companies"))
+    ok, _ = route_and_upload_fast(record, prefer_tables=["Companies"])
+    return ok > 0
 
 
 def upload_contact(record: Mapping[str, Any]) -> bool:
-    res = route_and_upload(record, prefer_tables=["Company Contacts"])
-    return bool(res.get("Company Contacts"))
+    ok, _ = route_and_upload_fast(record, prefer_tables=["Company Contacts"])
+    return ok > 0
 
 
 def upload_phone(record: Mapping[str, Any]) -> bool:
-    res = route_and_upload(record, prefer_tables=["Phone Numbers"])
-    return bool(res.get("Phone Numbers"))
+    ok, _ = route_and_upload_fast(record, prefer_tables=["Phone Numbers"])
+    return ok > 0
 
 
 def upload_email(record: Mapping[str, Any]) -> bool:
-    res = route_and_upload(record, prefer_tables=["Email Addresses"])
-    return bool(res.get("Email Addresses"))
+    ok, _ = route_and_upload_fast(record, prefer_tables=["Email Addresses"])
+    return ok > 0
 
 
 def upload_probate(record: Mapping[str, Any]) -> bool:
-    res = route_and_upload(record, prefer_tables=["Probate"])
-    return bool(res.get("Probate"))
+    ok, _ = route_and_upload_fast(record, prefer_tables=["Probate"])
+    return ok > 0
 
 
 def upload_lien(record: Mapping[str, Any]) -> bool:
-    res = route_and_upload(record, prefer_tables=["Liens"])
-    return bool(res.get("Liens"))
+    ok, _ = route_and_upload_fast(record, prefer_tables=["Liens"])
+    return ok > 0
 
 
 def upload_foreclosure(record: Mapping[str, Any]) -> bool:
-    res = route_and_upload(record, prefer_tables=["Foreclosure"])
-    return bool(res.get("Foreclosure"))
+    ok, _ = route_and_upload_fast(record, prefer_tables=["Foreclosure"])
+    return ok > 0
 
 
 def upload_aod(record: Mapping[str, Any]) -> bool:
-    res = route_and_upload(record, prefer_tables=["AOD"])
-    return bool(res.get("AOD"))
+    ok, _ = route_and_upload_fast(record, prefer_tables=["AOD"])
+    return ok > 0
 
 
 def upload_mortgage(record: Mapping[str, Any]) -> bool:
-    res = route_and_upload(record, prefer_tables=["Mortgages"])
-    return bool(res.get("Mortgages"))
+    ok, _ = route_and_upload_fast(record, prefer_tables=["Mortgages"])
+    return ok > 0
 
 
 def upload_vacant(record: Mapping[str, Any]) -> bool:
-    res = route_and_upload(record, prefer_tables=["Vacant"])
-    return bool(res.get("Vacant"))
\ No newline at end of file
+    ok, _ = route_and_upload_fast(record, prefer_tables=["Vacant"])
+    return ok > 0
+
+
+# ---------- Warm-up ----------
+
+def prefetch_schemas() -> None:
+    """
+    Fetch every mapped table's live schema concurrently so the first batch
+    doesn't pay one Meta API round trip per table, serially.
+    """
+    with ThreadPoolExecutor(max_workers=len(BASE_MAP)) as executor:
+        list(executor.map(lambda m: _fetch_schema_set(m["base_id"], m["table_name"]), BASE_MAP.values()))
+
+
+# Preopen one Table client per mapped table (no network) so uploads never build them mid-loop
+for _meta in BASE_MAP.values():
+    _get_table(_meta["base_id"], _meta["table_name"])
+del _meta
@@ -3,16 +3,38 @@
 from __future__ import annotations
 
 import ast
+import asyncio
+import atexit
 import json
+import logging
 import os
+import queue
+import random
+import sys
 import time
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Mapping, MutableMapping, Optional, Tuple
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, MutableMapping, Optional, Tuple
+from urllib.parse import quote
 
 import requests
 from airtable import Airtable
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from dotenv import load_dotenv
 
+from airtable_utils.rate_limit import TokenBucket, bucket_for, status_retry_delay
+
+try:
+    import aiohttp
+except ImportError:  # optional: only needed for route_and_upload_async
+    aiohttp = None
+
+try:
+    from orjson import loads as _json_loads
+except ImportError:  # optional: faster JSON decoding when installed
+    _json_loads = json.loads
+
 load_dotenv()
 
 API_KEY = os.getenv("AIRTABLE_API_KEY")
@@ -25,7 +47,7 @@ if not API_KEY:
 PROPERTY_TABLE = {
     "base_id": "app3Aa7p8C1dOZAyc",
     "table_name": "Properties",
-    "fallback_fields": {
+    "fallback_fields": frozenset({
         "Property Address",
         "Owner Name",
         "Status",
@@ -33,27 +55,90 @@ PROPERTY_TABLE = {
         "Motivation Score",
         "Source ZIP",
         "Scrape Timestamp",
-    },
+    }),
 }
 
 LOG_DIR = Path("logs")
 LOG_DIR.mkdir(exist_ok=True)
 LOG_PATH = LOG_DIR / f"uploads_{time.strftime('%Y%m%d_%H%M%S')}.log"
 
+# One pooled adapter shared by the metadata session and every Airtable client
+# session, so TLS connections are reused across calls. Retries only cover
+# idempotent requests (urllib3 never re-sends POSTs by default).
+_ADAPTER = HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=32,
+    max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504)),
+)
+_SESSION = requests.Session()
+_SESSION.mount("https://", _ADAPTER)
+_SESSION.headers["Authorization"] = f"Bearer {API_KEY}"
+
 _SCHEMA_CACHE: Dict[Tuple[str, str], List[str]] = {}
 _CLIENT_CACHE: Dict[Tuple[str, str], Airtable] = {}
 
+# Live schemas persisted across runs, keyed "base_id|table_name"
+SCHEMA_CACHE_PATH = LOG_DIR / "schema_cache.json"
+SCHEMA_CACHE_TTL = 3600
+_DISK_SCHEMAS: Dict[str, List[str]] = {}
+
+
+def _load_schema_cache() -> None:
+    try:
+        if time.time() - SCHEMA_CACHE_PATH.stat().st_mtime > SCHEMA_CACHE_TTL:
+            return
+        data = json.loads(SCHEMA_CACHE_PATH.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return
+    for key, fields in data.items():
+        base_id, _, table_name = key.partition("|")
+        if table_name and isinstance(fields, list):
+            _DISK_SCHEMAS[key] = fields
+            _SCHEMA_CACHE[(base_id, table_name)] = fields
+
+
+def _save_schema_cache() -> None:
+    tmp_path = SCHEMA_CACHE_PATH.with_suffix(".tmp")
+    try:
+        tmp_path.write_text(json.dumps(_DISK_SCHEMAS), encoding="utf-8")
+        os.replace(tmp_path, SCHEMA_CACHE_PATH)
+    except OSError:
+        pass
+
+
+_load_schema_cache()
+
+
+# Log lines go through a queue to a listener thread that owns stdout and the log
+# file, so upload loops never block on console flushes or disk writes.
+_LOG_QUEUE: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+logger = logging.getLogger("airtable_upload")
+logger.setLevel(logging.INFO)
+logger.propagate = False
+logger.addHandler(QueueHandler(_LOG_QUEUE))
+
+_console_handler = logging.StreamHandler(sys.stdout)
+_file_handler = logging.FileHandler(LOG_PATH, encoding="utf-8", delay=True)
+for _handler in (_console_handler, _file_handler):
+    _handler.setFormatter(logging.Formatter("%(message)s"))
+_LOG_LISTENER = QueueListener(_LOG_QUEUE, _console_handler, _file_handler)
+_LOG_LISTENER.start()
+atexit.register(_LOG_LISTENER.stop)
+del _handler
+
 
 def _log(line: str) -> None:
-    print(line)
-    with LOG_PATH.open("a", encoding="utf-8") as handle:
-        handle.write(line + "\n")
+    logger.info(line)
 
 
 def _get_airtable_client(base_id: str, table_name: str) -> Airtable:
     cache_key = (base_id, table_name)
     if cache_key not in _CLIENT_CACHE:
-        _CLIENT_CACHE[cache_key] = Airtable(base_id, table_name, api_key=API_KEY)
+        client = Airtable(base_id, table_name, api_key=API_KEY)
+        # Pacing is done by the per-base token bucket, not batch_insert's fixed sleep
+        client.API_LIMIT = 0
+        client.session.mount("https://", _ADAPTER)
+        _CLIENT_CACHE[cache_key] = client
     return _CLIENT_CACHE[cache_key]
 
 
@@ -63,15 +148,16 @@ def _fetch_table_fields(base_id: str, table_name: str) -> List[str]:
         return _SCHEMA_CACHE[cache_key]
 
     url = f"https://api.airtable.com/v0/meta/bases/{base_id}/tables"
-    headers = {"Authorization": f"Bearer {API_KEY}"}
     try:
-        response = requests.get(url, headers=headers, timeout=10)
+        response = _SESSION.get(url, timeout=10)
         if response.status_code == 200:
             data = response.json()
             for table in data.get("tables", []):
                 if table.get("name") == table_name:
                     fields = [field.get("name") for field in table.get("fields", []) if field.get("name")]
                     _SCHEMA_CACHE[cache_key] = fields
+                    _DISK_SCHEMAS[f"{base_id}|{table_name}"] = fields
+                    _save_schema_cache()
                     return fields
     except requests.RequestException as exc:
         _log(f"⚠️ Unable to fetch schema for {table_name}: {exc}")
@@ -84,12 +170,19 @@ def _fetch_table_fields(base_id: str, table_name: str) -> List[str]:
 def _coerce_value(value: Any) -> Any:
     if value is None:
         return ""
+    # Hot path: scraped values are almost always plain str/int/float; exact type
+    # checks skip the isinstance chain (bool stays as-is, as it did via int).
+    cls = type(value)
+    if cls is str:
+        return value.strip()
+    if cls is int or cls is float or cls is bool:
+        return value
     if isinstance(value, (int, float)):
         return value
     if isinstance(value, bool):
         return "Yes" if value else "No"
     if isinstance(value, (list, tuple, set)):
-        return ", ".join(str(item) for item in value if item not in (None, ""))
+        return ", ".join(str(item) for item in value if item is not None and item != "")
     if isinstance(value, dict):
         return json.dumps(value, default=str)
     return str(value).strip()
@@ -97,10 +190,9 @@ def _coerce_value(value: Any) -> Any:
 
 def _extract(raw: Mapping[str, Any], *keys: str) -> Any:
     for key in keys:
-        if key in raw:
-            val = raw.get(key)
-            if val is not None and str(val).strip():
-                return val
+        val = raw.get(key)
+        if val is not None and str(val).strip():
+            return val
     return None
 
 
@@ -108,6 +200,11 @@ def _coerce_record(record: Any) -> Any:
     if isinstance(record, str):
         text = record.strip()
         if text.startswith("{") and text.endswith("}"):
+            # Most payloads are JSON; only Python-literal dicts need the AST walk
+            try:
+                return _json_loads(text)
+            except ValueError:
+                pass
             try:
                 return ast.literal_eval(text)
             except (ValueError, SyntaxError):
@@ -115,58 +212,54 @@ def _coerce_record(record: Any) -> Any:
     return record
 
 
+_ADDRESS_ALIASES: Tuple[str, ...] = ("Property Address", "property_address", "full_address", "address")
+
+# Airtable field -> raw keys to try, in order (address is handled separately)
+_FALLBACK_PLAN: Tuple[Tuple[str, Tuple[str, ...]], ...] = (
+    ("Owner Name", ("Owner Name", "owner_name", "Owner", "seller_name")),
+    ("Status", ("Status", "status")),
+    ("Estimated Value", ("Estimated Value", "estimated_value", "est_value")),
+    ("Motivation Score", ("Motivation Score", "motivation_score", "motivation")),
+    ("Source ZIP", ("Source ZIP", "source_zip", "zip", "ZIP")),
+)
+
+
 def normalize_property_record(raw: Any, valid_fields: Iterable[str]) -> Optional[Dict[str, Any]]:
     if not isinstance(raw, Mapping):
         return None
 
-    valid_set = set(valid_fields)
-    address = _coerce_value(
-        _extract(
-            raw,
-            "Property Address",
-            "property_address",
-            "full_address",
-            "address",
-        )
-    )
+    # Callers normalizing a batch pass the schema pre-frozen; don't rebuild it per record
+    valid_set = valid_fields if isinstance(valid_fields, (set, frozenset)) else frozenset(valid_fields)
+    address = _coerce_value(_extract(raw, *_ADDRESS_ALIASES))
     if not address:
         return None
 
     normalized: Dict[str, Any] = {}
-    fallback_sources = {
-        "Property Address": address,
-        "Owner Name": _coerce_value(
-            _extract(raw, "Owner Name", "owner_name", "Owner", "seller_name")
-        ),
-        "Status": _coerce_value(_extract(raw, "Status", "status")),
-        "Estimated Value": _coerce_value(
-            _extract(raw, "Estimated Value", "estimated_value", "est_value")
-        ),
-        "Motivation Score": _coerce_value(
-            _extract(raw, "Motivation Score", "motivation_score", "motivation")
-        ),
-        "Source ZIP": _coerce_value(
-            _extract(raw, "Source ZIP", "source_zip", "zip", "ZIP")
-        ),
-    }
-
-    fallback_sources["Scrape Timestamp"] = time.strftime("%Y-%m-%d %H:%M:%S")
-
-    for key, value in fallback_sources.items():
-        if key in valid_set:
-            normalized[key] = _coerce_value(value)
-
-    for key, value in raw.items():
-        if key in valid_set and key not in normalized:
-            normalized[key] = _coerce_value(value)
+    if "Property Address" in valid_set:
+        normalized["Property Address"] = address
+    for field, aliases in _FALLBACK_PLAN:
+        if field in valid_set:
+            value = _coerce_value(_extract(raw, *aliases))
+            if value != "":
+                normalized[field] = value
+    if "Scrape Timestamp" in valid_set:
+        normalized["Scrape Timestamp"] = time.strftime("%Y-%m-%d %H:%M:%S")
+
+    # Only walk keys the schema accepts; the intersection runs as one C-level pass
+    for key in raw.keys() & valid_set:
+        if key not in normalized:
+            value = _coerce_value(raw[key])
+            if value != "":
+                normalized[key] = value
 
     return normalized if normalized.get("Property Address") else None
 
 
-def _safe_create_record(client: Airtable, record: Dict[str, Any]) -> bool:
+def _safe_batch_create(client: Airtable, records: List[Dict[str, Any]], base_id: Optional[str] = None) -> bool:
     for attempt in range(3):
         try:
-            client.create(record)
+            bucket_for(base_id or PROPERTY_TABLE["base_id"]).acquire()
+            client.batch_insert(records)
             return True
         except Exception as exc:
             error_text = str(exc)
@@ -180,25 +273,37 @@ def _safe_create_record(client: Airtable, record: Dict[str, Any]) -> bool:
     return False
 
 
-def _safe_batch_create(client: Airtable, records: List[Dict[str, Any]]) -> bool:
-    payload = [{"fields": rec} for rec in records]
-    for attempt in range(3):
-        try:
-            client.batch_create(payload)
-            return True
-        except Exception as exc:
-            error_text = str(exc)
-            if "429" in error_text or "Rate" in error_text:
-                time.sleep(2 ** attempt)
-                continue
-            if attempt < 2:
-                time.sleep(1)
-                continue
-            raise
-    return False
+def _iter_normalized(materialised: List[Any], schema: frozenset, counts: Dict[str, int]) -> Iterator[Dict[str, Any]]:
+    sample_logged = False
+    for idx, raw in enumerate(materialised, start=1):
+        record = _coerce_record(raw)
+        normalized = normalize_property_record(record, schema)
+        if not normalized:
+            counts["skipped"] += 1
+            _log(f"⚠️ Skipping record #{idx}: invalid or empty payload.")
+            continue
+
+        if not sample_logged:
+            _log(f"🧠 Sample upload: {json.dumps(normalized, indent=2)}")
+            sample_logged = True
+
+        yield normalized
+
+
+def _log_summary(summary: Dict[str, int]) -> None:
+    _log(
+        "✅ Upload Summary — Total: {total}, Uploaded: {uploaded}, Skipped: {skipped}, Failed: {failed}".format(
+            **summary
+        )
+    )
 
 
 def route_and_upload(records: Iterable[Any], batch_size: Optional[int] = None) -> Dict[str, int]:
+    """
+    Normalize and upload property records through Airtable's batch endpoint.
+    Records are buffered and sent `batch_size` at a time (default and maximum
+    is Airtable's 10 records per request); the remainder is flushed at the end.
+    """
     if not API_KEY:
         _log("⚠️ AIRTABLE_API_KEY not configured. Skipping upload.")
         return {"total": 0, "uploaded": 0, "skipped": 0, "failed": 0}
@@ -209,71 +314,122 @@ def route_and_upload(records: Iterable[Any], batch_size: Optional[int] = None) -
         _log("ℹ️ No records to upload.")
         return {"total": 0, "uploaded": 0, "skipped": 0, "failed": 0}
 
+    batch_size = min(batch_size or Airtable.MAX_RECORDS_PER_REQUEST, Airtable.MAX_RECORDS_PER_REQUEST)
     base_id = PROPERTY_TABLE["base_id"]
     table_name = PROPERTY_TABLE["table_name"]
     client = _get_airtable_client(base_id, table_name)
-    schema = _fetch_table_fields(base_id, table_name)
+    schema = frozenset(_fetch_table_fields(base_id, table_name))
 
-    uploaded = skipped = failed = 0
+    counts = {"total": total, "uploaded": 0, "skipped": 0, "failed": 0}
     buffer: List[Dict[str, Any]] = []
-    sample_logged = False
-
-    for idx, raw in enumerate(materialised, start=1):
-        record = _coerce_record(raw)
-        normalized = normalize_property_record(record, schema)
-        if not normalized:
-            skipped += 1
-            _log(f"⚠️ Skipping record #{idx}: invalid or empty payload.")
-            continue
-
-        if not sample_logged:
-            _log(f"🧠 Sample upload: {json.dumps(normalized, indent=2)}")
-            sample_logged = True
-
-        if batch_size:
-            buffer.append(normalized)
-            if len(buffer) >= batch_size:
-                try:
-                    _safe_batch_create(client, buffer)
-                    uploaded += len(buffer)
-                    for rec in buffer:
-                        _log(f"✅ Uploaded Property: {rec['Property Address']}")
-                except Exception as exc:
-                    failed += len(buffer)
-                    _log(f"❌ Batch upload failed ({len(buffer)} records): {exc}")
-                buffer = []
-            continue
 
+    def flush() -> None:
         try:
-            _safe_create_record(client, normalized)
-            uploaded += 1
-            _log(f"✅ Uploaded Property #{idx}: {normalized['Property Address']}")
-        except Exception as exc:
-            failed += 1
-            _log(f"❌ Upload failed for record #{idx}: {exc}")
-
-    if batch_size and buffer:
-        try:
-            _safe_batch_create(client, buffer)
-            uploaded += len(buffer)
+            _safe_batch_create(client, buffer, base_id)
+            counts["uploaded"] += len(buffer)
             for rec in buffer:
                 _log(f"✅ Uploaded Property: {rec['Property Address']}")
         except Exception as exc:
-            failed += len(buffer)
+            counts["failed"] += len(buffer)
             _log(f"❌ Batch upload failed ({len(buffer)} records): {exc}")
+        buffer.clear()
 
-    summary = {
-        "total": total,
-        "uploaded": uploaded,
-        "skipped": skipped,
-        "failed": failed,
-    }
-    _log(
-        "✅ Upload Summary — Total: {total}, Uploaded: {uploaded}, Skipped: {skipped}, Failed: {failed}".format(
-            **summary
+    for normalized in _iter_normalized(materialised, schema, counts):
+        buffer.append(normalized)
+        if len(buffer) >= batch_size:
+            flush()
+
+    if buffer:
+        flush()
+
+    _log_summary(counts)
+    return counts
+
+
+# Airtable allows 5 requests per second per base
+ASYNC_MAX_CONCURRENCY = 5
+
+
+async def _aupload(
+    session: Any, sem: asyncio.Semaphore, bucket: TokenBucket, url: str, rows: List[Dict[str, Any]],
+    max_attempts: int = 3,
+) -> None:
+    """
+    POST one batch, retrying 429/5xx (honouring Retry-After) and dropped or
+    timed-out connections; raises once the batch can't be delivered.
+    """
+    payload = {"records": [{"fields": row} for row in rows]}
+    async with sem:
+        for attempt in range(1, max_attempts + 1):
+            throttled = False
+            await bucket.acquire_async()
+            try:
+                async with session.post(url, json=payload) as resp:
+                    if resp.status == 200:
+                        return
+                    error = f"Airtable returned {resp.status}: {(await resp.text())[:200]}"
+                    delay = status_retry_delay(resp.status, resp.headers, attempt)
+                    throttled = resp.status == 429
+            except (aiohttp.ClientError, asyncio.TimeoutError) as exc:
+                error = f"Airtable request failed: {exc!r}"
+                delay = random.uniform(0, min(8, 2 ** attempt))
+            if delay is None or attempt == max_attempts:
+                raise RuntimeError(error)
+            if throttled:
+                bucket.backoff(delay)
+                continue
+            await asyncio.sleep(delay)
+
+
+async def route_and_upload_async(records: Iterable[Any], batch_size: Optional[int] = None) -> Dict[str, int]:
+    """
+    Async counterpart of route_and_upload: batches are POSTed concurrently over
+    one aiohttp session, at most ASYNC_MAX_CONCURRENCY in flight. Requires aiohttp.
+    """
+    if aiohttp is None:
+        raise RuntimeError("route_and_upload_async requires aiohttp (pip install aiohttp)")
+    if not API_KEY:
+        _log("⚠️ AIRTABLE_API_KEY not configured. Skipping upload.")
+        return {"total": 0, "uploaded": 0, "skipped": 0, "failed": 0}
+
+    materialised: List[Any] = list(records or [])
+    total = len(materialised)
+    if total == 0:
+        _log("ℹ️ No records to upload.")
+        return {"total": 0, "uploaded": 0, "skipped": 0, "failed": 0}
+
+    batch_size = min(batch_size or Airtable.MAX_RECORDS_PER_REQUEST, Airtable.MAX_RECORDS_PER_REQUEST)
+    base_id = PROPERTY_TABLE["base_id"]
+    table_name = PROPERTY_TABLE["table_name"]
+    schema = frozenset(await asyncio.to_thread(_fetch_table_fields, base_id, table_name))
+    url = f"https://api.airtable.com/v0/{base_id}/{quote(table_name, safe='')}"
+
+    counts = {"total": total, "uploaded": 0, "skipped": 0, "failed": 0}
+    rows = list(_iter_normalized(materialised, schema, counts))
+    batches = [rows[i:i + batch_size] for i in range(0, len(rows), batch_size)]
+
+    sem = asyncio.Semaphore(ASYNC_MAX_CONCURRENCY)
+    headers = {"Authorization": f"Bearer {API_KEY}"}
+    connector = aiohttp.TCPConnector(limit_per_host=ASYNC_MAX_CONCURRENCY, keepalive_timeout=30)
+    async with aiohttp.ClientSession(
+        headers=headers, connector=connector, timeout=aiohttp.ClientTimeout(total=30)
+    ) as session:
+        results = await asyncio.gather(
+            *(_aupload(session, sem, bucket_for(base_id), url, batch) for batch in batches),
+            return_exceptions=True,
         )
-    )
-    return summary
+
+    for batch, result in zip(batches, results):
+        if isinstance(result, BaseException):
+            counts["failed"] += len(batch)
+            _log(f"❌ Batch upload failed ({len(batch)} records): {result}")
+        else:
+            counts["uploaded"] += len(batch)
+            for rec in batch:
+                _log(f"✅ Uploaded Property: {rec['Property Address']}")
+
+    _log_summary(counts)
+    return counts
 
 
 def upload_batch(records: Iterable[Any], batch_size: int = 10) -> Dict[str, int]:
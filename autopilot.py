@@ -2,21 +2,37 @@
 # 🤖 DealMachine Autopilot — AI Market Executor
 # ============================================
 
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from scraper.login_utils import get_driver, login
 from scraper.zip_search import search_zip
 from scraper.scraper_core import scroll_and_scrape_properties
 from config.filters_engine import apply_quick_filters, apply_advanced_filters
-from airtable_utils.router import batch_upload  # unified router
+from airtable_utils.router import batch_upload, prefetch_schemas  # unified router
 from config.zips import MARKETS  # all elite markets
 
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
+# Uploads run here so the browser can move on to the next ZIP meanwhile
+_UPLOAD_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="autopilot-upload")
+
+
+def _upload_zip(properties, zip_code):
+    try:
+        batch_upload(properties)
+        print(f"✅ Uploaded batch for ZIP {zip_code}")
+    except Exception as e:
+        print(f"⚠️ Upload error for {zip_code}: {e}")
+
 
 def autopilot_run():
     print("🚀 Launching DealMachine Autopilot...\n")
+    # Warm Airtable schemas in the background while the browser starts
+    threading.Thread(target=prefetch_schemas, daemon=True).start()
+
     driver = get_driver()
     if not driver:
         print("❌ Failed to initialize driver.")
@@ -31,6 +47,7 @@ def autopilot_run():
     # 🌎 Iterate through all elite markets and ZIPs
     for market, zips in MARKETS.items():
         print(f"\n🌆 Starting Market: {market}")
+        pending = []
         for zip_code in zips:
             print(f"\n===== Processing ZIP: {zip_code} =====")
 
@@ -69,21 +86,21 @@ def autopilot_run():
                 print(f"⚠️ No properties found for ZIP {zip_code}")
                 continue
 
-            # ☁️ Upload all scraped properties
+            # ☁️ Upload all scraped properties in the background
             print(f"📤 Uploading {len(properties)} scraped properties to Airtable...")
-            try:
-                batch_upload(properties)
-                print(f"✅ Uploaded batch for ZIP {zip_code}")
-            except Exception as e:
-                print(f"⚠️ Upload error for {zip_code}: {e}")
+            pending.append(_UPLOAD_POOL.submit(_upload_zip, properties, zip_code))
 
             # 🌙 Optional rest interval between ZIPs
             time.sleep(5)
 
+        # Let this market's uploads finish before reporting it complete
+        for future in pending:
+            future.result()
         print(f"🏁 Completed Market: {market}")
         time.sleep(10)
 
     driver.quit()
+    _UPLOAD_POOL.shutdown(wait=True)
     print("\n✅ Autopilot completed for all markets and ZIPs.")
 
 
@@ -1,34 +1,200 @@
 """
 filters_engine.py
 Elite-tier unified filter executor for DealMachine automation
+
+Relies on implicit_wait=0 (set by get_driver/create_driver): the find_elements
+snapshots here expect an empty result immediately on a miss.
 """
 
+from collections.abc import Mapping
+from functools import lru_cache
+
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, ElementClickInterceptedException
-import time
+from selenium.common.exceptions import (
+    TimeoutException,
+    ElementClickInterceptedException,
+    StaleElementReferenceException,
+)
+
+from config.search_presets import flatten_filters
+
+
+# ---------------------------------------------
+# 🧭 Cached locators
+# ---------------------------------------------
+MORE_BUTTON_LOCATOR = (By.XPATH, "//button[contains(., 'More')] | //div[contains(text(),'More')]")
+APPLY_BUTTON_LOCATOR = (By.XPATH, "//button[contains(., 'Apply')]")
+DIALOG_LOCATOR = (By.XPATH, "//div[@role='dialog']")
+DIALOG_LABELS_LOCATOR = (By.XPATH, "//div[@role='dialog']//label")
+
+
+def _xpath_literal(text):
+    """Quote `text` as an XPath string literal, even when it contains both quote kinds."""
+    text = str(text)
+    if "'" not in text:
+        return f"'{text}'"
+    if '"' not in text:
+        return f'"{text}"'
+    parts = text.split("'")
+    return "concat(" + ", \"'\", ".join(f"'{part}'" for part in parts) + ")"
+
+
+@lru_cache(maxsize=512)
+def _quick_xpath(label):
+    return (By.XPATH, f"//*[contains(text(), {_xpath_literal(label)})]")
+
+
+@lru_cache(maxsize=512)
+def _advanced_xpath(label):
+    return (By.XPATH, f"//label[contains(., {_xpath_literal(label)})]")
+
+
+def _get_cached(driver, key, locator, timeout=6):
+    """
+    Clickable element for `locator`, reused across calls on the same driver
+    while it's still attached and clickable; re-resolved (and re-cached) after
+    a re-render or navigation makes it stale.
+    """
+    cache = getattr(driver, "_el_cache", None)
+    if cache is None:
+        cache = driver._el_cache = {}
+    element = cache.get(key)
+    if element is not None:
+        try:
+            if element.is_displayed() and element.is_enabled():
+                return element
+        except StaleElementReferenceException:
+            pass
+    element = WebDriverWait(driver, timeout).until(EC.element_to_be_clickable(locator))
+    cache[key] = element
+    return element
+
+
+# ---------------------------------------------
+# ⏱️ Event-driven waits (replace fixed sleeps)
+# ---------------------------------------------
+def wait_for_state(driver, predicate, timeout=4, poll=0.1):
+    """Poll `predicate(driver)` until truthy; returns False on timeout instead of raising."""
+    try:
+        return WebDriverWait(driver, timeout, poll_frequency=poll).until(lambda d: predicate(d))
+    except TimeoutException:
+        return False
+
+
+def _toggle_state(element):
+    """Snapshot of the attributes a filter chip/checkbox flips when clicked."""
+    return (
+        element.get_attribute("aria-pressed"),
+        element.get_attribute("aria-checked"),
+        element.get_attribute("class"),
+    )
+
+
+def _state_changed(element, before):
+    def _predicate(_driver):
+        try:
+            return _toggle_state(element) != before
+        except StaleElementReferenceException:
+            # Element was re-rendered: the click registered
+            return True
+    return _predicate
+
+
+# ---------------------------------------------
+# 📦 Batched in-browser clicks
+# ---------------------------------------------
+# Clicks every [label, xpath] entry in one round-trip: the first visible,
+# enabled match is scrolled into view and clicked. Returns one boolean per entry.
+# With textScan, all labels are resolved together in a single TreeWalker pass
+# over the page's text nodes (a superset of the contains(text(), ...) XPath)
+# instead of one XPath walk per label.
+# A chip click can re-render the bar and detach the nodes found up front, so
+# each entry is re-resolved just before its click when its node is no longer
+# connected; if that fails it reports false and takes the per-label path.
+BATCH_CLICK_JS = """
+const [entries, textScan] = arguments;
+const visible = (el) => el && el.getClientRects().length > 0 && !el.disabled;
+const viaXPath = (xpath) => {
+    const snap = document.evaluate(xpath, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    for (let i = 0; i < snap.snapshotLength; i++) {
+        if (visible(snap.snapshotItem(i))) return snap.snapshotItem(i);
+    }
+    return null;
+};
+const found = entries.map(() => null);
+if (textScan) {
+    const pending = new Map(entries.map(([label], i) => [i, label]));
+    const walker = document.createTreeWalker(document.body, NodeFilter.SHOW_TEXT);
+    for (let node = walker.nextNode(); node && pending.size; node = walker.nextNode()) {
+        for (const [i, label] of pending) {
+            if (node.data.includes(label) && visible(node.parentElement)) {
+                found[i] = node.parentElement;
+                pending.delete(i);
+            }
+        }
+    }
+}
+return entries.map(([label, xpath], i) => {
+    let el = found[i] || (textScan ? null : viaXPath(xpath));
+    if (el && !el.isConnected) el = viaXPath(xpath);
+    if (!el || !el.isConnected) return false;
+    el.scrollIntoView({block: 'center'});
+    el.click();
+    return true;
+});
+"""
+
+
+def _filter_pairs(filters):
+    """(label, value) pairs from a label -> value mapping or a plain list of labels."""
+    if isinstance(filters, Mapping):
+        return list(filters.items())
+    return [(label, True) for label in filters]
+
+
+def _batch_click(driver, labels, xpath_for, text_scan=False):
+    """Click all labels in one execute_script call; returns the labels that weren't found."""
+    entries = [[str(label), xpath_for(label)[1]] for label in labels]
+    try:
+        results = driver.execute_script(BATCH_CLICK_JS, entries, text_scan) or []
+    except Exception as e:
+        print(f"⚠️ Batched filter clicks failed, falling back per label: {e}")
+        return list(labels)
+    return [label for label, ok in zip(labels, results) if not ok] + list(labels[len(results):])
 
 
 # ---------------------------------------------
 # 🎯 Core Quick Filter Logic
 # ---------------------------------------------
-def apply_quick_filters(driver, filters):
-    print(f"🎯 Applying quick filters: {list(filters.keys()) if isinstance(filters, dict) else filters}")
-    for label in filters:
+def _apply_quick_filter(driver, label):
+    try:
+        element = WebDriverWait(driver, 8).until(
+            EC.element_to_be_clickable(_quick_xpath(label))
+        )
+        before = _toggle_state(element)
         try:
-            element = WebDriverWait(driver, 8).until(
-                EC.element_to_be_clickable((By.XPATH, f"//*[contains(text(), '{label}')]"))
-            )
-            try:
-                element.click()
-            except ElementClickInterceptedException:
-                driver.execute_script("arguments[0].click();", element)
+            element.click()
+        except ElementClickInterceptedException:
+            driver.execute_script("arguments[0].click();", element)
+        print(f"✅ Applied quick filter: {label}")
+        # Move on as soon as the chip flips (capped at the old 0.5s pause)
+        wait_for_state(driver, _state_changed(element, before), timeout=0.5)
+    except TimeoutException:
+        print(f"⚠️ Quick filter not found: {label}")
+
+
+def apply_quick_filters(driver, filters):
+    print(f"🎯 Applying quick filters: {list(filters.keys()) if isinstance(filters, Mapping) else filters}")
+    labels = list(filters)
+    missed = _batch_click(driver, labels, _quick_xpath, text_scan=True)
+    for label in labels:
+        if label not in missed:
             print(f"✅ Applied quick filter: {label}")
-            time.sleep(0.5)
-        except TimeoutException:
-            print(f"⚠️ Quick filter not found: {label}")
-            continue
+    # Chips that weren't rendered yet get the waiting per-label path
+    for label in missed:
+        _apply_quick_filter(driver, label)
 
 
 # ---------------------------------------------
@@ -37,12 +203,14 @@ def apply_quick_filters(driver, filters):
 def open_advanced_filters(driver):
     """Attempt to open advanced filters panel."""
     try:
-        more_button = WebDriverWait(driver, 6).until(
-            EC.element_to_be_clickable((By.XPATH, "//button[contains(., 'More')] | //div[contains(text(),'More')]"))
-        )
+        more_button = _get_cached(driver, "more", MORE_BUTTON_LOCATOR)
         driver.execute_script("arguments[0].click();", more_button)
         print("✅ Advanced filters panel opened")
-        time.sleep(1)
+        wait_for_state(
+            driver,
+            EC.visibility_of_element_located(DIALOG_LOCATOR),
+            timeout=1,
+        )
         return True
     except TimeoutException:
         print("❌ Could not open advanced filters")
@@ -52,27 +220,61 @@ def open_advanced_filters(driver):
 # ---------------------------------------------
 # 🧠 Apply Advanced Filters Dynamically
 # ---------------------------------------------
+def _apply_advanced_filter(driver, label, value):
+    try:
+        checkbox = WebDriverWait(driver, 6).until(
+            EC.element_to_be_clickable(_advanced_xpath(label))
+        )
+        driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", checkbox)
+        before = _toggle_state(checkbox)
+        driver.execute_script("arguments[0].click();", checkbox)
+        print(f"✅ Enabled advanced filter: {label} = {value}")
+        wait_for_state(driver, _state_changed(checkbox, before), timeout=0.3)
+    except TimeoutException:
+        print(f"⚠️ Advanced filter not found: {label}")
+
+
+def _dialog_labels(driver):
+    """Snapshot every label in the open panel once: text -> element."""
+    try:
+        return {e.text.strip(): e for e in driver.find_elements(*DIALOG_LABELS_LOCATOR)}
+    except StaleElementReferenceException:
+        return {}
+
+
+def _click_cached_label(driver, elements, label, value):
+    """Click `label` from a `_dialog_labels` snapshot; False if it isn't there (or went stale)."""
+    match = next((text for text in elements if str(label) in text), None)
+    if match is None:
+        return False
+    try:
+        driver.execute_script(
+            "arguments[0].scrollIntoView({block: 'center'}); arguments[0].click();", elements[match]
+        )
+    except StaleElementReferenceException:
+        return False
+    print(f"✅ Enabled advanced filter: {label} = {value}")
+    return True
+
+
 def apply_advanced_filters(driver, advanced_filters):
     """Click all labels that match advanced filter names."""
     if not open_advanced_filters(driver):
         return
 
-    for label, value in advanced_filters.items() if isinstance(advanced_filters, dict) else enumerate(advanced_filters):
-        try:
-            checkbox = WebDriverWait(driver, 6).until(
-                EC.element_to_be_clickable((By.XPATH, f"//label[contains(., '{label}')]"))
-            )
-            driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", checkbox)
-            driver.execute_script("arguments[0].click();", checkbox)
+    pairs = _filter_pairs(advanced_filters)
+    missed = set(_batch_click(driver, [label for label, _ in pairs], _advanced_xpath))
+    # The panel is already rendered: resolve the misses from one label snapshot
+    # and only fall back to a waiting lookup for what still isn't there
+    elements = _dialog_labels(driver) if missed else {}
+    for label, value in pairs:
+        if label not in missed:
             print(f"✅ Enabled advanced filter: {label} = {value}")
-            time.sleep(0.3)
-        except TimeoutException:
-            print(f"⚠️ Advanced filter not found: {label}")
+        elif not _click_cached_label(driver, elements, label, value):
+            _apply_advanced_filter(driver, label, value)
 
     try:
-        apply_btn = WebDriverWait(driver, 6).until(
-            EC.element_to_be_clickable((By.XPATH, "//button[contains(., 'Apply')]"))
-        )
+        apply_btn = _get_cached(driver, "apply", APPLY_BUTTON_LOCATOR)
         driver.execute_script("arguments[0].click();", apply_btn)
         print("✅ Applied all advanced filters")
     except TimeoutException:
@@ -82,15 +284,38 @@ def apply_advanced_filters(driver, advanced_filters):
 # ---------------------------------------------
 # 🚀 Unified Runner
 # ---------------------------------------------
-def run_filters(driver, filter_set):
-    """Apply both quick and advanced filters in a unified flow."""
+def run_filters(driver, filter_set, quick_keys=None):
+    """
+    Apply both quick and advanced filters in a unified flow. `filter_set` is a
+    tuple of FilterEntry (e.g. `SEARCH_TIERS_FLAT[tier]`); a preset mapping is
+    flattened first. `quick_keys` overrides the quick-filter labels.
+    """
     if not filter_set:
         print("⚠️ No filters provided for this search.")
         return
 
-    quick_keys = [k for k in filter_set.keys() if filter_set[k] is True] if isinstance(filter_set, dict) else filter_set
+    entries = flatten_filters(filter_set) if isinstance(filter_set, Mapping) else filter_set
+    if quick_keys is None:
+        quick_keys = [e.label for e in entries if e.is_quick]
 
     print("🧭 Starting filter sequence...")
     apply_quick_filters(driver, quick_keys)
-    apply_advanced_filters(driver, filter_set)
-    print("✅ Completed filter sequence.")
\ No newline at end of file
+    # The panel sees every entry, as before: some True flags (e.g. "Contact Has
+    # Phone Number?") only exist as dialog checkboxes
+    apply_advanced_filters(driver, {e.label: e.value for e in entries})
+    print("✅ Completed filter sequence.")
+
+
+# ---------------------------------------------
+# 🔥 Pre-warm locator cache from search presets
+# ---------------------------------------------
+def _prewarm_locators():
+    from config.search_presets import SEARCH_TIERS_FLAT
+
+    for entries in SEARCH_TIERS_FLAT.values():
+        for entry in entries:
+            _quick_xpath(entry.label)
+            _advanced_xpath(entry.label)
+
+
+_prewarm_locators()
@@ -2,8 +2,25 @@
 # 🔥 DealMachine Advanced Search Presets
 # ============================================
 
+from collections import ChainMap
+from types import MappingProxyType
+from typing import Any, NamedTuple
+
+
+class FilterEntry(NamedTuple):
+    label: str
+    is_quick: bool
+    value: Any
+
+
+def flatten_filters(filter_set):
+    """Preset mapping -> tuple of FilterEntry (quick filters are the keys set to True)."""
+    return tuple(FilterEntry(k, v is True, v) for k, v in filter_set.items())
+
+
 # --- Universal Base Filters (applied to ALL searches) ---
-BASE_FILTERS = {
+# Read-only view; tiers chain onto it instead of copying it
+BASE_FILTERS = MappingProxyType({
     # Quick Filters
     "Off Market": True,
     "High Equity": True,
@@ -29,33 +46,30 @@ BASE_FILTERS = {
     "Year Built": "<=2005",
     "Living Area (sqft)": ">800",
     "Condition": "Fair or Poor",
-}
+})
 
 # --- Tier 1: Kill-Shot Distress ---
 # Short-supply but highest motivation
-TIER_1 = {
-    **BASE_FILTERS,
+TIER_1 = ChainMap({
     "Preforeclosures": True,
     "Probates": True,
     "Tax Delinquent": True,
     "Vacant Homes": True,
     "Tired Landlords": True,
     "Zombie Properties": True,
-}
+}, BASE_FILTERS)
 
 # --- Tier 2: Predictive Fatigue / Aging Equity ---
-TIER_2 = {
-    **BASE_FILTERS,
+TIER_2 = ChainMap({
     "Senior Owners": True,
     "Free and Clear": True,
     "Intrafamily Transfer": True,
     "Likely to Move": True,
     "Long Ownership (Years)": ">12",
-}
+}, BASE_FILTERS)
 
 # --- Tier 3: Income / Multifamily / Cashflow ---
-TIER_3 = {
-    **BASE_FILTERS,
+TIER_3 = ChainMap({
     "Property Types": [
         "Duplex (2 Units, Any Combination)",
         "Triplex (3 Units, Any Combination)",
@@ -67,11 +81,10 @@ TIER_3 = {
     ],
     "Tired Landlords": True,
     "Absentee Owners": True,
-}
+}, BASE_FILTERS)
 
 # --- Tier 4: Commercial / Redevelopment ---
-TIER_4 = {
-    **BASE_FILTERS,
+TIER_4 = ChainMap({
     "Property Types": [
         "Commercial (general)",
         "Commercial Building",
@@ -86,7 +99,7 @@ TIER_4 = {
     "Tax Delinquent": True,
     "Preforeclosures": True,
     "Vacant Homes": True,
-}
+}, BASE_FILTERS)
 
 # --- Combine all tiers into dictionary ---
 SEARCH_TIERS = {
@@ -96,6 +109,17 @@ SEARCH_TIERS = {
     "Tier 4 – Commercial Redevelopment": TIER_4,
 }
 
+
+def _quick(tier):
+    return tuple(k for k, v in tier.items() if v is True)
+
+
+# --- Quick-filter labels per tier (the keys switched on with True) ---
+SEARCH_TIERS_QUICK = {name: _quick(tier) for name, tier in SEARCH_TIERS.items()}
+
+# --- Flattened tiers: what run_filters iterates over ---
+SEARCH_TIERS_FLAT = {name: flatten_filters(tier) for name, tier in SEARCH_TIERS.items()}
+
 # --- Default property-type focus groups ---
 PROPERTY_CLUSTERS = {
     "Residential Core": [
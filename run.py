@@ -6,63 +6,136 @@ from scraper.login_utils import get_driver, login
 from scraper.zip_search import search_zip
 from scraper.scraper_core import scroll_and_scrape_properties
 from config.filters_engine import apply_quick_filters
-from airtable_utils.router import batch_upload  # ✅ unified router import
+from airtable_utils.router import batch_upload, prefetch_schemas  # ✅ unified router import
 from config.zips import MARKETS
 
-import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from multiprocessing import Manager
+import hashlib
+import itertools
+import os
+import threading
 
+# Parallel browser sessions; each worker process owns one driver + login
+MAX_WORKERS = int(os.getenv("SCRAPER_WORKERS", "4"))
 
-def main():
-    print("🚀 Starting DealMachine Scraper...\n")
 
-    # ✅ Initialize the browser
-    driver = get_driver()
-    if not driver:
-        print("[!] Driver failed to initialize")
-        return
+def _record_key(record):
+    raw = f"{record.get('Property Address')}|{record.get('Owner Name')}|{record.get('Estimated Value')}"
+    return hashlib.sha256(raw.encode()).digest()
 
-    try:
-        # 1️⃣ Login
-        if not login(driver):
-            print("[!] Login failed — stopping execution.")
-            return
-
-        # 2️⃣ Loop through all configured markets & zips
-        for market, zips in MARKETS.items():
-            print(f"\n🌎 Market: {market}")
-            for zip_code in zips:
-                print(f"\n===== Processing ZIP: {zip_code} =====")
-                success = search_zip(driver, zip_code)
 
-                if not success:
-                    print(f"[!] Skipping ZIP {zip_code} due to search failure.")
-                    continue
+_CLAIM_TOKENS = itertools.count()
 
-                # 3️⃣ Apply quick filters (can later switch to advanced filter engine)
-                apply_quick_filters(driver, filters=["Vacant", "High Equity", "Absentee"])
 
-                # 4️⃣ Scrape properties in the current ZIP
-                property_records = scroll_and_scrape_properties(driver, source_zip=zip_code)
+def _claim_record(record, seen):
+    """
+    True if this call is the first to claim `record` in the shared `seen` dict
+    (adjacent ZIPs overlap). One atomic setdefault round-trip: the token is
+    unique per call, so only the winning claimant gets its own token back.
+    """
+    token = (os.getpid(), next(_CLAIM_TOKENS))
+    return seen.setdefault(_record_key(record), token) == token
 
-                if not property_records:
-                    print(f"[!] No properties found in ZIP {zip_code}")
-                    continue
 
-                # 5️⃣ Upload results via unified router
-                try:
-                    print("📦 Uploading batch to Airtable...")
-                    batch_upload(property_records)
-                    print(f"✅ Uploaded {len(property_records)} records for {zip_code}")
-                except Exception as e:
-                    print(f"⚠️ Upload failed for ZIP {zip_code}: {e}")
+def _upload_zip(property_records, zip_code):
+    try:
+        print("📦 Uploading batch to Airtable...")
+        batch_upload(property_records)
+        print(f"✅ Uploaded {len(property_records)} records for {zip_code}")
+    except Exception as e:
+        print(f"⚠️ Upload failed for ZIP {zip_code}: {e}")
+
+
+def process_zip(driver, market, zip_code, upload_pool, uploads, seen):
+    """
+    Search → filter → scrape a single ZIP on an already logged-in driver, then
+    hand the upload to `upload_pool` so the next ZIP starts scraping right away.
+    """
+    print(f"\n===== [{market}] Processing ZIP: {zip_code} =====")
+    success = search_zip(driver, zip_code)
+
+    if not success:
+        print(f"[!] Skipping ZIP {zip_code} due to search failure.")
+        return 0
+
+    # 3️⃣ Apply quick filters (can later switch to advanced filter engine)
+    apply_quick_filters(driver, filters=["Vacant", "High Equity", "Absentee"])
+
+    # 4️⃣ Scrape properties in the current ZIP; records another ZIP already
+    # claimed are dropped before the scraper saves or uploads them
+    fresh = scroll_and_scrape_properties(
+        driver, source_zip=zip_code, record_filter=lambda record: _claim_record(record, seen)
+    )
+
+    if not fresh:
+        print(f"[!] No new properties found in ZIP {zip_code}")
+        return 0
+
+    # 5️⃣ Upload results via unified router (in the background; the router
+    # paces requests per base, so no inter-ZIP sleep is needed)
+    uploads.append(upload_pool.submit(_upload_zip, fresh, zip_code))
+    return len(fresh)
+
+
+def process_shard(worklist, seen):
+    """
+    Worker entry point: one browser + login reused for every ZIP in the shard.
+    `seen` is the Manager dict of record hashes shared by all workers.
+    """
+    # Warm this process's Airtable schemas in the background while the browser starts
+    threading.Thread(target=prefetch_schemas, daemon=True).start()
 
-                # 🕐 Optional: brief delay between zips to avoid rate limiting
-                time.sleep(5)
+    driver = get_driver()
+    if not driver:
+        print("[!] Driver failed to initialize")
+        return 0
 
+    scraped = 0
+    upload_pool = ThreadPoolExecutor(max_workers=2)
+    uploads = []
+    try:
+        # 1️⃣ Login
+        if not login(driver):
+            print("[!] Login failed — stopping this worker.")
+            return 0
+
+        for market, zip_code in worklist:
+            try:
+                scraped += process_zip(driver, market, zip_code, upload_pool, uploads, seen)
+            except Exception as e:
+                print(f"⚠️ ZIP {zip_code} failed: {e}")
     finally:
-        # Always close the browser
         driver.quit()
-        print("\n[✓] Driver closed\n✅ Scraper finished successfully.")
+        # Let queued uploads finish before the worker exits
+        for future in as_completed(uploads):
+            future.result()
+        upload_pool.shutdown()
+    return scraped
+
+
+def main():
+    print("🚀 Starting DealMachine Scraper...\n")
+
+    # 2️⃣ Flatten all configured markets & zips, then deal them round-robin so
+    # every worker gets a mix of markets
+    worklist = [(market, zip_code) for market, zips in MARKETS.items() for zip_code in zips]
+    workers = max(1, min(MAX_WORKERS, len(worklist)))
+    shards = [worklist[i::workers] for i in range(workers)]
+
+    total = 0
+    with Manager() as manager, ProcessPoolExecutor(max_workers=workers) as pool:
+        seen = manager.dict()
+        futures = {pool.submit(process_shard, shard, seen): idx for idx, shard in enumerate(shards)}
+        for future in as_completed(futures):
+            try:
+                scraped = future.result()
+                total += scraped
+                print(f"🧩 Worker {futures[future]} finished: {scraped} properties")
+            except Exception as e:
+                print(f"⚠️ Worker {futures[future]} crashed: {e}")
+
+    print(f"\n[✓] Drivers closed\n✅ Scraper finished successfully ({total} properties).")
 
 
 if __name__ == "__main__":
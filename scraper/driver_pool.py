@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+# ===============================================================
+# 🚗 DealMachine Driver Pool
+# Reuses Chrome sessions across ZIPs instead of booting one per ZIP
+# ===============================================================
+
+from __future__ import annotations
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Tuple
+
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.chrome.options import Options
+# Keep webdriver-manager quiet; set before it's imported so its logger picks it up
+os.environ.setdefault("WDM_LOG_LEVEL", "0")
+os.environ.setdefault("WDM_PRINT_FIRST_LINE", "False")
+from webdriver_manager.chrome import ChromeDriverManager
+
+from scraper.login_utils import BLOCKED_URLS, disable_implicit_wait
+from scraper.page_scripts import install_init_script
+
+
+# ---------------------------------------------------------------
+# 🚀 Driver Initialization
+# ---------------------------------------------------------------
+# Headless runs only read the sidebar: also drop images, web fonts and map tiles
+HEADLESS_BLOCKED_URLS = BLOCKED_URLS + [
+    "*.png",
+    "*.jpg",
+    "*.jpeg",
+    "*.gif",
+    "*.woff",
+    "*.woff2",
+    "*.pbf",
+    "*://*.tiles.mapbox.com/*",
+    "*://api.mapbox.com/v4/*",
+]
+_DRIVER_PATH: str | None = None
+_DRIVER_PATH_LOCK = threading.Lock()
+# Resolved path persisted next to webdriver-manager's own cache (./.wdm with WDM_LOCAL)
+_DRIVER_PATH_FILE = (Path(".wdm") if os.getenv("WDM_LOCAL") == "1" else Path.home() / ".wdm") / "chromedriver_path.txt"
+# Same horizon as webdriver-manager's version-check cache
+_DRIVER_PATH_TTL = 24 * 60 * 60
+
+
+def _cached_driver_path() -> str | None:
+    try:
+        if time.time() - _DRIVER_PATH_FILE.stat().st_mtime > _DRIVER_PATH_TTL:
+            return None
+        path = _DRIVER_PATH_FILE.read_text(encoding="utf-8").strip()
+    except OSError:
+        return None
+    return path if path and Path(path).is_file() else None
+
+
+def _driver_path() -> str:
+    """
+    Resolve the chromedriver binary once per process, and across processes via
+    _DRIVER_PATH_FILE for a day (webdriver-manager's install() hits the network).
+    """
+    global _DRIVER_PATH
+    if _DRIVER_PATH is None:
+        with _DRIVER_PATH_LOCK:
+            if _DRIVER_PATH is None:
+                path = _cached_driver_path()
+                if path is None:
+                    path = ChromeDriverManager().install()
+                    try:
+                        _DRIVER_PATH_FILE.parent.mkdir(parents=True, exist_ok=True)
+                        _DRIVER_PATH_FILE.write_text(path, encoding="utf-8")
+                    except OSError:
+                        pass
+                _DRIVER_PATH = path
+    return _DRIVER_PATH
+
+
+def create_driver(headless: bool = True):
+    """Create a new Chrome driver instance with robust options."""
+    options = Options()
+    # Hand control back at DOMContentLoaded instead of after every sub-resource
+    options.page_load_strategy = "eager"
+    options.add_argument("--log-level=3")
+    options.add_argument("--disable-notifications")
+    options.add_argument("--disable-infobars")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--window-size=1920,1080")
+    options.add_argument("--disable-blink-features=AutomationControlled")
+    options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    options.add_experimental_option("useAutomationExtension", False)
+    if headless:
+        options.add_argument("--headless=new")
+
+    try:
+        driver = webdriver.Chrome(service=Service(_driver_path()), options=options)
+        driver.set_page_load_timeout(60)
+        disable_implicit_wait(driver)
+        try:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd(
+                "Network.setBlockedURLs", {"urls": HEADLESS_BLOCKED_URLS if headless else BLOCKED_URLS}
+            )
+        except Exception as e:
+            print(f"⚠️ Could not enable URL blocking: {e}")
+        install_init_script(driver)
+        return driver
+    except Exception as e:
+        print(f"❌ Failed to initialize Chrome: {e}")
+        raise
+
+
+# ---------------------------------------------------------------
+# ♻️ Pool
+# ---------------------------------------------------------------
+class DriverPool:
+    """
+    Up to `size` Chrome sessions, spawned lazily on first demand and handed out
+    with acquire()/release() (or the lease() context manager). A driver is quit
+    and replaced after `max_reuse` leases or as soon as a lease fails.
+    """
+
+    def __init__(self, size: int = 1, headless: bool = True, max_reuse: int = 25) -> None:
+        self.size = max(1, size)
+        self.headless = headless
+        self.max_reuse = max_reuse
+        self._idle: List[Any] = []
+        self._uses: Dict[int, int] = {}
+        self._spawned = 0
+        # Guards the fields above; notified whenever a driver is returned or a
+        # slot frees up, so a waiting acquire() can take it or spawn
+        self._cond = threading.Condition()
+
+    def acquire(self) -> Tuple[Any, int]:
+        """Return (driver, reuse_count); blocks while all `size` drivers are leased."""
+        with self._cond:
+            while True:
+                if self._idle:
+                    driver = self._idle.pop()
+                    return driver, self._uses[id(driver)]
+                if self._spawned < self.size:
+                    self._spawned += 1
+                    break
+                self._cond.wait()
+        try:
+            driver = create_driver(headless=self.headless)
+        except Exception:
+            with self._cond:
+                self._spawned -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self._uses[id(driver)] = 0
+        return driver, 0
+
+    def release(self, driver, healthy: bool = True) -> None:
+        """Return a leased driver: reset and requeue it, or quit it when spent/unhealthy."""
+        uses = self._uses.get(id(driver), 0) + 1
+        if healthy and uses < self.max_reuse:
+            try:
+                # Cheap state reset between ZIPs instead of a new browser.
+                # DealMachine has no in-page filter reset, so navigate away
+                driver.delete_all_cookies()
+                driver.get("about:blank")
+                with self._cond:
+                    self._uses[id(driver)] = uses
+                    self._idle.append(driver)
+                    self._cond.notify()
+                return
+            except Exception as e:
+                print(f"⚠️ Driver reset failed, recycling it: {e}")
+        self._discard(driver)
+
+    @contextmanager
+    def lease(self) -> Iterator[Any]:
+        """`with pool.lease() as driver:` — any exception inside retires the driver."""
+        driver, _ = self.acquire()
+        healthy = True
+        try:
+            yield driver
+        except BaseException:
+            healthy = False
+            raise
+        finally:
+            self.release(driver, healthy)
+
+    def close(self) -> None:
+        """Quit every idle driver (leased ones are quit when released unhealthy)."""
+        with self._cond:
+            idle, self._idle = self._idle, []
+        for driver in idle:
+            self._discard(driver)
+
+    def _discard(self, driver) -> None:
+        """Quit `driver` and free its slot, waking an acquire() that can now spawn."""
+        with self._cond:
+            self._uses.pop(id(driver), None)
+            self._spawned -= 1
+            self._cond.notify()
+        try:
+            driver.quit()
+        except Exception:
+            pass
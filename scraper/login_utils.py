@@ -7,14 +7,59 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.common.action_chains import ActionChains
 import os
-import time
 from dotenv import load_dotenv
 
+from scraper.page_scripts import install_init_script
+
 # === Load environment variables ===
 load_dotenv()
 EMAIL = os.getenv("DEALMACHINE_EMAIL")
 PASSWORD = os.getenv("DEALMACHINE_PASSWORD")
 BRAVE_PATH = os.getenv("BRAVE_PATH", "/Applications/Brave Browser.app/Contents/MacOS/Brave Browser")
+# Set SCRAPER_LOAD_IMAGES=1 when debugging DOM interactions that depend on images
+LOAD_IMAGES = os.getenv("SCRAPER_LOAD_IMAGES") == "1"
+
+# Third-party analytics/chat/session-replay hosts the scraper never needs;
+# blocked at the network layer via CDP
+BLOCKED_URLS = [
+    "*://*.segment.io/*",
+    "*://*.segment.com/*",
+    "*://*.intercom.io/*",
+    "*://*.intercomcdn.com/*",
+    "*://*.google-analytics.com/*",
+    "*://*.googletagmanager.com/*",
+    "*://*.doubleclick.net/*",
+    "*://*.fullstory.com/*",
+    "*://*.hotjar.com/*",
+]
+
+# Sets an input's value in one round-trip. Goes through the native setter so
+# React's value tracker sees the change, then fires input/change like typing would.
+SET_INPUT_JS = """
+const [el, value] = arguments;
+Object.getOwnPropertyDescriptor(HTMLInputElement.prototype, 'value').set.call(el, value);
+el.dispatchEvent(new Event('input', {bubbles: true}));
+el.dispatchEvent(new Event('change', {bubbles: true}));
+return el.value === value;
+"""
+
+
+def _set_input(driver, element, value):
+    """Fill `element` via SET_INPUT_JS; falls back to send_keys if the value didn't stick."""
+    element.clear()
+    if not driver.execute_script(SET_INPUT_JS, element, value or ""):
+        element.send_keys(value)
+
+
+def disable_implicit_wait(driver):
+    """
+    Pin the implicit wait to 0 so only explicit WebDriverWaits ever block, and
+    read it back from the session: an implicit wait would stall every miss.
+    """
+    driver.implicitly_wait(0)
+    implicit = driver.timeouts.implicit_wait
+    if implicit != 0:
+        print(f"⚠️ Implicit wait is {implicit}s after pinning it to 0")
 
 
 def get_driver():
@@ -26,6 +71,8 @@ def get_driver():
 
     options = Options()
     options.binary_location = BRAVE_PATH
+    # Hand control back once the DOM is interactive instead of after every sub-resource
+    options.page_load_strategy = "eager"
     options.add_argument("--window-size=1920,1080")
     options.add_argument("--disable-blink-features=AutomationControlled")
     options.add_argument("--disable-extensions")
@@ -33,8 +80,12 @@ def get_driver():
     options.add_argument("--no-sandbox")
     options.add_argument("--disable-dev-shm-usage")
     options.add_argument("--ignore-certificate-errors")
-    options.add_argument("--disable-images")
-    options.add_argument("--blink-settings=imagesEnabled=false")
+    prefs = {"profile.default_content_setting_values.notifications": 2}
+    if not LOAD_IMAGES:
+        options.add_argument("--disable-images")
+        options.add_argument("--blink-settings=imagesEnabled=false")
+        prefs["profile.managed_default_content_settings.images"] = 2
+    options.add_experimental_option("prefs", prefs)
     options.add_experimental_option("excludeSwitches", ["enable-automation"])
     options.add_experimental_option("useAutomationExtension", False)
 
@@ -47,6 +98,13 @@ def get_driver():
     try:
         driver = webdriver.Chrome(service=service, options=options)
         driver.set_page_load_timeout(60)
+        disable_implicit_wait(driver)
+        try:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URLS})
+        except Exception as e:
+            print(f"⚠️ Could not enable URL blocking: {e}")
+        install_init_script(driver)
         print("✅ Brave WebDriver initialized successfully")
         return driver
     except Exception as e:
@@ -62,22 +120,19 @@ def login(driver):
     try:
         driver.get("https://app.dealmachine.com/login")
         print("[>] Opened DealMachine login page")
-        time.sleep(2)
 
         # Email
         email_input = WebDriverWait(driver, 20).until(
             EC.visibility_of_element_located((By.XPATH, "//input[@placeholder='Email Address']"))
         )
-        email_input.clear()
-        email_input.send_keys(EMAIL)
+        _set_input(driver, email_input, EMAIL)
         print("[+] Email entered")
 
         # Password
         password_input = WebDriverWait(driver, 10).until(
             EC.visibility_of_element_located((By.XPATH, "//input[@placeholder='Password']"))
         )
-        password_input.clear()
-        password_input.send_keys(PASSWORD)
+        _set_input(driver, password_input, PASSWORD)
         print("[+] Password entered")
 
         # Click “Continue With Email”
@@ -85,7 +140,8 @@ def login(driver):
             EC.element_to_be_clickable((By.XPATH, "//div[text()='Continue With Email']"))
         )
         driver.execute_script("arguments[0].scrollIntoView(true);", login_button)
-        time.sleep(0.5)
+        # Settle on the button being clickable after the scroll, not a fixed pause
+        WebDriverWait(driver, 5).until(EC.element_to_be_clickable(login_button))
         try:
             login_button.click()
         except Exception:
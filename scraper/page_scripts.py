@@ -0,0 +1,60 @@
+"""
+page_scripts.py
+Scripts every DealMachine page gets at document start (Page.addScriptToEvaluateOnNewDocument),
+so helpers don't have to ship them to the browser on each call.
+"""
+
+import json
+
+# Map/modal layers that swallow clicks meant for the list and filter chips
+OVERLAY_BLOCKERS = [
+    ".ReactModal__Overlay",
+    ".deal-overlay",
+    ".mapboxgl-canvas",
+    ".mapboxgl-control-container",
+]
+
+# One stylesheet rule neutralizes current and future overlays; it's attached as
+# soon as the document has a root element. Re-running it on a page that already
+# has the rule is a single attribute lookup.
+INIT_JS = """
+(() => {
+    const css = %s.join(',') + '{pointer-events:none !important;}';
+    const attach = () => {
+        if (document.querySelector("style[data-scraper='overlay-guard']")) return true;
+        const root = document.head || document.documentElement;
+        if (!root) return false;
+        const style = document.createElement('style');
+        style.dataset.scraper = 'overlay-guard';
+        style.textContent = css;
+        root.appendChild(style);
+        return true;
+    };
+    if (!attach()) {
+        const observer = new MutationObserver(() => { if (attach()) observer.disconnect(); });
+        observer.observe(document, {childList: true, subtree: true});
+    }
+})();
+""" % json.dumps(OVERLAY_BLOCKERS)
+
+
+def install_init_script(driver) -> bool:
+    """Register INIT_JS for every new document in `driver`; False when CDP isn't available."""
+    try:
+        driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": INIT_JS})
+        driver._overlay_guard_installed = True
+        return True
+    except Exception as e:
+        print(f"⚠️ Could not install page init script: {e}")
+        return False
+
+
+def ensure_overlay_guard(driver) -> bool:
+    """
+    True when INIT_JS is registered for every new document (nothing to do);
+    otherwise attach the overlay rule to the current page and return False.
+    """
+    if getattr(driver, "_overlay_guard_installed", False):
+        return True
+    driver.execute_script(INIT_JS)
+    return False
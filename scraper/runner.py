@@ -4,67 +4,76 @@
 # ===============================================================
 
 from __future__ import annotations
+import os
 import random
+import threading
 import time
 import traceback
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import zip_longest
 from pathlib import Path
+from typing import Dict, List, Optional, Tuple
 
 from config.zips import TARGET_ZIP_MAP
+from scraper.driver_pool import DriverPool, create_driver
 from scraper.scraper_core import scroll_and_scrape_properties
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
 from selenium.common.exceptions import WebDriverException, TimeoutException
-from webdriver_manager.chrome import ChromeDriverManager
-
-
-# ---------------------------------------------------------------
-# 🚀 Driver Initialization
-# ---------------------------------------------------------------
-def create_driver(headless: bool = True):
-    """Create a new Chrome driver instance with robust options."""
-    options = Options()
-    options.add_argument("--disable-notifications")
-    options.add_argument("--disable-infobars")
-    options.add_argument("--disable-gpu")
-    options.add_argument("--no-sandbox")
-    options.add_argument("--disable-dev-shm-usage")
-    options.add_argument("--window-size=1920,1080")
-    options.add_argument("--disable-blink-features=AutomationControlled")
-    options.add_experimental_option("excludeSwitches", ["enable-automation"])
-    options.add_experimental_option("useAutomationExtension", False)
-    if headless:
-        options.add_argument("--headless=new")
-
-    try:
-        driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
-        driver.set_page_load_timeout(60)
-        return driver
-    except Exception as e:
-        print(f"❌ Failed to initialize Chrome: {e}")
-        raise
 
 
 # ---------------------------------------------------------------
 # 🧠 Self-Healing Market Runner
 # ---------------------------------------------------------------
-def run_market_cycle(markets: dict, pause_between_zips: float = 6.0, max_retries: int = 3):
-    """Run through all ZIPs across all markets, restarting driver when needed."""
-    print("🚀 Starting self-healing auto-cycle scrape...\n")
-
-    total_scraped = 0
-    cycle_start = time.strftime("%Y-%m-%d %H:%M:%S")
-    print(f"🕒 Session started at {cycle_start}\n")
-
-    for market, zips in markets.items():
-        print(f"🏙️ Now scraping market: {market} ({len(zips)} ZIPs)")
-        for idx, zip_code in enumerate(zips, 1):
-            retry = 0
-            success = False
-            while retry < max_retries and not success:
-                try:
-                    print(f"\n📍 [{market}] ZIP {zip_code} (Attempt {retry+1}/{max_retries})")
-                    driver = create_driver(headless=True)
+# Concurrent ZIPs (one pooled browser each); at most one ZIP per market at a time
+MAX_WORKERS = int(os.getenv("SCRAPER_WORKERS", "4"))
+
+
+class MarketRateLimiter:
+    """
+    Spaces ZIP starts within a market by `interval` (+ up to `jitter`) seconds,
+    measured on time.monotonic(). A worker sleeps only for what's left of the
+    gap, so a ZIP that took longer than the pause starts the next one at once.
+    """
+
+    def __init__(self, interval: float, jitter: float = 3.0):
+        self.interval = interval
+        self.jitter = jitter
+        self._nexts: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def wait(self, market: str) -> None:
+        with self._lock:
+            now = time.monotonic()
+            next_t = self._nexts.get(market, now)
+            # Reserve the following slot before sleeping so concurrent callers queue up
+            self._nexts[market] = max(now, next_t) + self.interval + random.uniform(0, self.jitter)
+        delay = next_t - now
+        if delay > 0:
+            time.sleep(delay)
+
+
+def _interleave(markets: dict) -> List[Tuple[str, str]]:
+    """(market, zip) tasks dealt round-robin across markets so neighbours differ."""
+    rows = zip_longest(*([(market, z) for z in zips] for market, zips in markets.items()))
+    return [task for row in rows for task in row if task is not None]
+
+
+def _scrape_zip(
+    pool: DriverPool,
+    market_locks: Dict[str, threading.Semaphore],
+    limiter: MarketRateLimiter,
+    market: str,
+    zip_code,
+    max_retries: int,
+) -> int:
+    """Worker: scrape one ZIP with retries on a leased driver; returns records scraped."""
+    with market_locks[market]:
+        # Waits out only what remains of the market's pause since its last ZIP started
+        limiter.wait(market)
+        for attempt in range(1, max_retries + 1):
+            try:
+                print(f"\n📍 [{market}] ZIP {zip_code} (Attempt {attempt}/{max_retries})")
+                # A failed lease retires the driver; the retry gets a fresh one
+                with pool.lease() as driver:
                     driver.get("https://dealmachine.com/app/map")
 
                     records = scroll_and_scrape_properties(
@@ -74,43 +83,65 @@ def run_market_cycle(markets: dict, pause_between_zips: float = 6.0, max_retries
                         deep_scrape=False,   # set True for full modal scraping
                         auto_filters=True,
                         modal_limit=0,
-                        auto_quit=True,
+                        auto_quit=False,
                         source_zip=str(zip_code),
+                        persist_seen=True,   # skip properties earlier cycles already sent
                     )
 
-                    print(f"✅ Completed ZIP {zip_code} — {len(records)} records scraped.")
-                    total_scraped += len(records)
-                    success = True
-                    time.sleep(random.uniform(pause_between_zips, pause_between_zips + 3))
-
-                except (WebDriverException, TimeoutException) as e:
-                    retry += 1
-                    print(f"⚠️ Browser or timeout issue on ZIP {zip_code}: {e}")
-                    traceback.print_exc()
-                    try:
-                        driver.quit()
-                    except Exception:
-                        pass
-                    time.sleep(5)
-                    if retry >= max_retries:
-                        print(f"❌ Skipping ZIP {zip_code} after {max_retries} failed attempts.")
-                        continue
-
-                except Exception as e:
-                    retry += 1
-                    print(f"⚠️ Unexpected error on ZIP {zip_code}: {e}")
-                    traceback.print_exc()
-                    try:
-                        driver.quit()
-                    except Exception:
-                        pass
-                    time.sleep(5)
-                    if retry >= max_retries:
-                        print(f"❌ Skipping ZIP {zip_code} after repeated errors.")
-                        continue
-
-        print(f"🏁 Finished market {market}.\n")
-        time.sleep(10)
+                print(f"✅ Completed ZIP {zip_code} — {len(records)} records scraped.")
+                return len(records)
+
+            except (WebDriverException, TimeoutException) as e:
+                print(f"⚠️ Browser or timeout issue on ZIP {zip_code}: {e}")
+                traceback.print_exc()
+                if attempt >= max_retries:
+                    print(f"❌ Skipping ZIP {zip_code} after {max_retries} failed attempts.")
+                    return 0
+                time.sleep(5)
+
+            except Exception as e:
+                print(f"⚠️ Unexpected error on ZIP {zip_code}: {e}")
+                traceback.print_exc()
+                if attempt >= max_retries:
+                    print(f"❌ Skipping ZIP {zip_code} after repeated errors.")
+                    return 0
+                time.sleep(5)
+    return 0
+
+
+def run_market_cycle(
+    markets: dict,
+    pause_between_zips: float = 6.0,
+    max_retries: int = 3,
+    max_workers: Optional[int] = None,
+):
+    """Run through all ZIPs across all markets, restarting driver when needed."""
+    print("🚀 Starting self-healing auto-cycle scrape...\n")
+
+    total_scraped = 0
+    cycle_start = time.strftime("%Y-%m-%d %H:%M:%S")
+    print(f"🕒 Session started at {cycle_start}\n")
+
+    tasks = _interleave(markets)
+    workers = max(1, min(max_workers or MAX_WORKERS, len(markets)))
+    market_locks = {market: threading.Semaphore(1) for market in markets}
+    limiter = MarketRateLimiter(pause_between_zips)
+    for market, zips in markets.items():
+        print(f"🏙️ Queued market: {market} ({len(zips)} ZIPs)")
+
+    pool = DriverPool(size=workers, headless=True)
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(
+                    _scrape_zip, pool, market_locks, limiter, market, zip_code, max_retries
+                ): (market, zip_code)
+                for market, zip_code in tasks
+            }
+            for future in as_completed(futures):
+                total_scraped += future.result()
+    finally:
+        pool.close()
 
     cycle_end = time.strftime("%Y-%m-%d %H:%M:%S")
     print(f"\n✅ Auto-cycle completed.")
@@ -7,15 +7,32 @@
 from __future__ import annotations
 
 import csv
+import hashlib
 import json
+import os
+import queue
 import random
 import re
+import threading
 import time
+from array import array
+from itertools import islice
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 from airtable_utils.mappings import PROPERTY_FIELDS
 
-from airtable_utils.router import route_and_upload, batch_upload
+from airtable_utils.router import route_and_upload, route_and_upload_batch
+from scraper.page_scripts import OVERLAY_BLOCKERS, ensure_overlay_guard
+
+try:
+    import orjson
+except ImportError:  # optional: faster JSON encoding when installed
+    orjson = None
+
+try:
+    import xxhash
+except ImportError:  # optional: faster address hashing when installed
+    xxhash = None
 
 from selenium.common.exceptions import (
     InvalidSessionIdException,
@@ -38,60 +55,242 @@ DEFAULT_FILTERS: List[str] = [
     "Pre-Foreclosure",
 ]
 
-PROPERTY_CARD_SELECTOR = (
-    "//div[contains(@class,'deal-scroll')]"
-    "//div[contains(@class,'deal-wrapper') or contains(@class,'property-card')]"
-)
+# Locators are (By, selector) pairs: CSS wherever it can express the match (the
+# browser's native selector engine), XPath only for matches on visible text.
+PROPERTY_CARD_SELECTOR = "div.deal-scroll div.deal-wrapper, div.deal-scroll div.property-card"
 CARD_CSS_SELECTORS: List[str] = [
     "div[data-testid='property-card']",
     "div.property-card",
     "div.card-property",
 ]
-CARD_FALLBACK_XPATH = "//div[contains(@class,'property-card') or contains(., 'Est. Value')]"
-
-PROPERTY_MODAL_SELECTOR = "//div[contains(@class,'property-details')]"
-MODAL_LOCATORS: List[str] = [
-    PROPERTY_MODAL_SELECTOR,
-    "//div[@data-testid='property-modal']",
-    "//div[contains(@class,'ReactModal__Content')]",
-    "//div[contains(@class,'modal') and contains(@class,'open')]",
-    "//div[contains(@role,'dialog') and (.//h1 or .//h2)]",
+# Structural fallback only; a text match like contains(., 'Est. Value') scans the whole DOM
+CARD_FALLBACK_CSS = PROPERTY_CARD_SELECTOR
+
+PROPERTY_MODAL_SELECTOR = "div.property-details"
+MODAL_LOCATORS: List[Tuple[str, str]] = [
+    (By.CSS_SELECTOR, PROPERTY_MODAL_SELECTOR),
+    (By.CSS_SELECTOR, "div[data-testid='property-modal']"),
+    (By.CSS_SELECTOR, "div.ReactModal__Content"),
+    (By.CSS_SELECTOR, "div.modal.open"),
+    (By.CSS_SELECTOR, "div[role*='dialog']:has(h1, h2)"),
 ]
 
-CLOSE_BUTTON_LOCATORS: List[str] = [
-    "//button[contains(@aria-label,'close')]",
-    "//button[contains(.,'Close')]",
-    "//div[contains(@class,'modal')]//button[contains(@class,'close')]",
-    "//div[contains(@class,'ReactModal__Content')]//button[contains(@class,'close')]",
+CLOSE_BUTTON_LOCATORS: List[Tuple[str, str]] = [
+    (By.CSS_SELECTOR, "button[aria-label*='close']"),
+    (By.XPATH, "//button[contains(.,'Close')]"),
+    (By.CSS_SELECTOR, "div.modal button.close, div.ReactModal__Content button.close"),
 ]
 
-OVERLAY_LOCATORS: List[str] = [
-    "//div[contains(@class,'modal-backdrop')]",
-    "//div[contains(@class,'ReactModal__Overlay')]",
+OVERLAY_LOCATORS: List[Tuple[str, str]] = [
+    (By.CSS_SELECTOR, "div.modal-backdrop"),
+    (By.CSS_SELECTOR, "div.ReactModal__Overlay"),
 ]
 
-FILTER_TOGGLE_LOCATORS: List[str] = [
-    "//button[contains(@class,'quick-filter')]",
-    "//button[contains(@class,'filters')]",
-    "//button[contains(.,'Filters')]",
-    "//button[contains(.,'Quick Filters')]",
+FILTER_TOGGLE_LOCATORS: List[Tuple[str, str]] = [
+    (By.CSS_SELECTOR, "button.quick-filter"),
+    (By.CSS_SELECTOR, "button.filters"),
+    (By.XPATH, "//button[contains(.,'Filters')]"),
 ]
 
-FILTER_CONTAINER_LOCATORS: List[str] = [
-    "//div[contains(@class,'quick-filters') and not(contains(@style,'display: none'))]",
-    "//div[contains(@class,'filters-panel') and not(contains(@style,'display: none'))]",
-    "//div[contains(@class,'modal')]//div[contains(@class,'filters') and contains(@class,'open')]",
-    "//div[contains(@class,'ReactModal__Content')]//div[contains(@class,'filters')]",
+FILTER_CONTAINER_LOCATORS: List[Tuple[str, str]] = [
+    (By.CSS_SELECTOR, "div.quick-filters:not([style*='display: none'])"),
+    (By.CSS_SELECTOR, "div.filters-panel:not([style*='display: none'])"),
+    (By.CSS_SELECTOR, "div.modal div.filters.open"),
+    (By.CSS_SELECTOR, "div.ReactModal__Content div.filters"),
 ]
 
-OVERLAY_BLOCKERS: List[str] = [
-    ".ReactModal__Overlay",
-    ".deal-overlay",
-    ".mapboxgl-canvas",
-    ".mapboxgl-control-container",
-]
+
+def _css_union(locators: List[Tuple[str, str]]) -> str:
+    """Join the CSS entries of a locator list into one selector group."""
+    return ", ".join(selector for by, selector in locators if by == By.CSS_SELECTOR)
+
+
+# Each list as one selector group: one query per poll instead of one wait per entry
+MODAL_UNION = _css_union(MODAL_LOCATORS)
+CLOSE_BUTTON_UNION = _css_union(CLOSE_BUTTON_LOCATORS)
+CLOSE_BUTTON_XPATHS = [selector for by, selector in CLOSE_BUTTON_LOCATORS if by == By.XPATH]
+FILTER_CONTAINER_UNION = _css_union(FILTER_CONTAINER_LOCATORS)
+# First element matching a selector group that's actually rendered, or null
+FIRST_VISIBLE_JS = (
+    "return [...document.querySelectorAll(arguments[0])]"
+    ".find((el) => el.getClientRects().length > 0) || null;"
+)
+
+# Shared by the niche-filter scripts: the filter container is looked up from its
+# selector group (first rendered match) and the chip for a label is the first
+# visible button, then role=option div, whose text contains it case-insensitively.
+# Both are re-queried on demand, so a panel that re-renders is picked up again.
+_NICHE_FILTER_FIND_JS = """
+const visible = (el) => el.getClientRects().length > 0;
+const findContainer = (group) => [...document.querySelectorAll(group)].find(visible) || null;
+const collect = (group) => {
+    const container = findContainer(group);
+    if (!container) return null;
+    // Lower-cased once per candidate, not once per candidate per label
+    const withText = (sel) => [...container.querySelectorAll(sel)]
+        .filter(visible)
+        .map((el) => [el, (el.textContent || '').toLowerCase()]);
+    return withText('button').concat(withText("div[role*='option']"));
+};
+const findChip = (candidates, label) => {
+    const needle = label.trim().toLowerCase();
+    const hit = (candidates || []).find(([, text]) => text.includes(needle));
+    return hit ? hit[0] : null;
+};
+const isActive = (el) => {
+    const classes = el.getAttribute('class') || '';
+    return el.getAttribute('aria-pressed') === 'true' || classes.includes('active') || classes.includes('selected');
+};
+"""
+# Clicks every requested filter in one call. A chip that an earlier click
+# detached is looked up again from a fresh query before its click. Returns
+# null when there's no container, else one boolean (clicked) per label.
+NICHE_FILTER_CLICK_JS = _NICHE_FILTER_FIND_JS + """
+const [group, labels] = arguments;
+let candidates = collect(group);
+if (!candidates) return null;
+return labels.map((label) => {
+    let target = findChip(candidates, label);
+    if (target && !target.isConnected) {
+        candidates = collect(group);
+        target = findChip(candidates, label);
+    }
+    if (!target) return false;
+    target.scrollIntoView({block: 'center'});
+    target.click();
+    return true;
+});
+"""
+# Whether each label's chip (freshly looked up) shows as active (same test as _is_active)
+NICHE_FILTER_STATE_JS = _NICHE_FILTER_FIND_JS + """
+const [group, labels] = arguments;
+const candidates = collect(group);
+return labels.map((label) => {
+    const chip = findChip(candidates, label);
+    return Boolean(chip && isActive(chip));
+});
+"""
+
+# Address hashes seen by earlier cycles (8 bytes each), for persist_seen=True runs
+SEEN_HASHES_PATH = Path("data/seen_hashes.bin")
+_SEEN_HASHES_LOCK = threading.Lock()
+
+AIRTABLE_BATCH_SIZE = 10  # Airtable's per-request record limit
+
+# Keys of every record scroll_and_scrape_properties emits (deep scrape only overwrites them)
+RECORD_FIELDS = ("Property Address", "Owner Name", "Estimated Value", "Status", "Source ZIP")
 
 ADDRESS_REGEX = re.compile(r"\d{3,5}\s+\w")
+# Substring alternations (same matches as the old keyword loops, one C-level scan per line)
+OWNER_REGEX = re.compile(r"LLC|Trust|Inc|Corp|Properties|Estates")
+VALUE_REGEX = re.compile(r"\$|value|est\.", re.I)
+TAG_REGEX = re.compile(r"vacant|absentee|lead|owner occ|high equity", re.I)
+
+# Async script: scrolls the results sidebar to the bottom and reports back as
+# soon as a MutationObserver sees it grow (true), or when timeoutMs passes
+# (false); null when there's no sidebar. No polling from the client.
+SCROLL_AND_WAIT_JS = """
+const [timeoutMs, done] = arguments;
+const sidebar = document.querySelector('.deal-scroll');
+if (!sidebar) { done(null); return; }
+const height = sidebar.scrollHeight;
+let finished = false;
+let timer = null;
+const finish = (grew) => {
+    if (finished) return;
+    finished = true;
+    observer.disconnect();
+    clearTimeout(timer);
+    done(grew);
+};
+const observer = new MutationObserver(() => {
+    if (sidebar.scrollHeight > height) finish(true);
+});
+observer.observe(sidebar, {childList: true, subtree: true});
+timer = setTimeout(() => finish(sidebar.scrollHeight > height), timeoutMs);
+sidebar.scrollBy(0, height);
+"""
+
+# Reads everything the parsers need from a card (or a modal): visible text,
+# chip/tag/badge texts and the address fallback node. Each element is also
+# tagged with a stable data-scr-id so it can be found again (CARD_BY_ID_CSS).
+CARD_BY_ID_CSS = '[data-scr-id="{}"]'
+_CARD_PAYLOAD_JS = """
+const addressRe = /\\d{3,5}\\s+\\w/;  // ADDRESS_REGEX
+const hintXPath = ".//*[contains(text(), ', ')]";
+const findHint = (el) => el.querySelector("[class*='address']")
+    || document.evaluate(hintXPath, el, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+const payload = (el) => {
+    const text = el.innerText || '';
+    // The hint is only read when no text line parses as an address
+    const hint = text.split('\\n').some((ln) => addressRe.test(ln)) ? null : findHint(el);
+    if (!el.dataset.scrId) el.dataset.scrId = String(window.__scrSeq = (window.__scrSeq || 0) + 1);
+    return {
+        scrId: el.dataset.scrId,
+        text: text,
+        chips: [...el.querySelectorAll("[class*='chip'],[class*='tag'],[class*='badge']")]
+            .map((c) => (c.innerText || '').trim())
+            .filter(Boolean),
+        addressHint: hint ? (hint.innerText || '').trim() : '',
+    };
+};
+"""
+# Async script: scrolls to and clicks a card (an element, or a CARD_BY_ID_CSS
+# selector), then waits in the page via a MutationObserver for a rendered modal
+# from the selector group. Calls back [modal, payload], null on timeout, or
+# false when the card is no longer in the DOM.
+OPEN_CARD_JS = _CARD_PAYLOAD_JS + """
+const [target, modalSelector, timeoutMs, done] = arguments;
+const card = typeof target === 'string' ? document.querySelector(target) : target;
+if (!card) { done(false); return; }
+const findModal = () => [...document.querySelectorAll(modalSelector)].find((el) => el.getClientRects().length > 0);
+let finished = false;
+let timer = null;
+const finish = (modal) => {
+    if (finished) return;
+    finished = true;
+    observer.disconnect();
+    clearTimeout(timer);
+    done(modal ? [modal, payload(modal)] : null);
+};
+const observer = new MutationObserver(() => {
+    const modal = findModal();
+    if (modal) finish(modal);
+});
+observer.observe(document.body, {childList: true, subtree: true, attributes: true, attributeFilter: ['class', 'style']});
+timer = setTimeout(() => finish(findModal()), timeoutMs);
+card.scrollIntoView({block: 'center'});
+card.click();
+"""
+# First rendered element of a selector group (the modal) with its payload, in
+# one call: [element, payload], or null while none is showing
+MODAL_READ_JS = _CARD_PAYLOAD_JS + """
+const modal = [...document.querySelectorAll(arguments[0])].find((el) => el.getClientRects().length > 0);
+return modal ? [modal, payload(modal)] : null;
+"""
+# Visible cards from the first selector that has any, else the fallback;
+# the visibility test runs in the page, not one is_displayed() call per card
+_FIND_CARDS_JS = """
+const visible = (el) => el.getClientRects().length > 0
+    && getComputedStyle(el).visibility !== 'hidden';
+const findCards = (selectors, fallbackCss) => {
+    for (const sel of selectors) {
+        const cards = [...document.querySelectorAll(sel)].filter(visible);
+        if (cards.length) return cards;
+    }
+    return [...document.querySelectorAll(fallbackCss)].filter(visible);
+};
+"""
+VISIBLE_CARDS_JS = _FIND_CARDS_JS + "return findCards(arguments[0], arguments[1]);"
+# Finds the visible cards (same selector order as _get_property_cards) and
+# returns {total, start, cards} with payloads for cards[start:] only; start
+# drops back to 0 if the list shrank. No element references cross the wire.
+CARD_SNAPSHOT_JS = _CARD_PAYLOAD_JS + _FIND_CARDS_JS + """
+const [selectors, fallbackCss, requested] = arguments;
+const cards = findCards(selectors, fallbackCss);
+const start = requested <= cards.length ? requested : 0;
+return {total: cards.length, start: start, cards: cards.slice(start).map(payload)};
+"""
 
 # -------------------------------------------------------------------------
 # 🧠 Filter & Utility Layer
@@ -110,200 +309,234 @@ def apply_niche_filters(driver, filters: Optional[Iterable[str]] = None, pause:
         _toggle_filters_panel(driver)
         container = _locate_filter_container(driver, timeout=8)
 
-    for label in labels:
-        if container is None or not container.is_displayed():
-            container = _locate_filter_container(driver, timeout=4)
-            if container is None:
-                print(f"⚠️ Filter container unavailable for '{label}'.")
-                continue
-        try:
-            button = _find_filter_button(container, label)
-            if button is None:
-                print(f"⚠️ Filter not found: {label}")
-                continue
-            driver.execute_script("arguments[0].scrollIntoView({block:'center'});", button)
-            driver.execute_script("arguments[0].click();", button)
+    if container is None:
+        print("⚠️ Filter container unavailable.")
+        return
+    try:
+        # Every toggle in one round-trip; they're independent chips
+        clicked = driver.execute_script(NICHE_FILTER_CLICK_JS, FILTER_CONTAINER_UNION, labels)
+    except Exception as exc:
+        print(f"⚠️ Error applying quick filters: {exc}")
+        return
+    if clicked is None:
+        print("⚠️ Filter container unavailable.")
+        return
+
+    pending = [label for label, ok in zip(labels, clicked) if ok]
+    active = set()
+    if pending:
+        # One wait for all clicked chips to show as active (capped at `pause`);
+        # chips are looked up afresh on each poll, so re-renders can't hide a miss
+        def _states(d):
+            states = d.execute_script(NICHE_FILTER_STATE_JS, FILTER_CONTAINER_UNION, pending) or []
+            active.update(label for label, on in zip(pending, states) if on)
+            return len(active) == len(pending)
+
+        _wait_until(driver, _states, pause)
+
+    for label, ok in zip(labels, clicked):
+        if label in active:
             print(f"✅ Applied filter: {label}")
-            time.sleep(pause)
-        except StaleElementReferenceException:
-            container = None
-        except Exception as exc:
-            print(f"⚠️ Error applying filter '{label}': {exc}")
+        elif ok:
+            print(f"⚠️ Filter clicked but not active: {label}")
+        else:
+            print(f"⚠️ Filter not found: {label}")
+
+
+def _wait_until(driver, predicate, timeout: float, poll: float = 0.1) -> bool:
+    """Poll `predicate(driver)` for up to `timeout`s; False on timeout or a stale element."""
+    try:
+        return bool(WebDriverWait(driver, timeout, poll_frequency=poll).until(predicate))
+    except (TimeoutException, StaleElementReferenceException):
+        return False
+
+
+def _is_active(element) -> bool:
+    classes = element.get_attribute("class") or ""
+    return element.get_attribute("aria-pressed") == "true" or "active" in classes or "selected" in classes
 
 
 def _dismiss_screen_overlays(driver) -> List[str]:
-    script = """
-    const selectors = arguments[0];
-    const handled = [];
-    selectors.forEach((sel) => {
-        document.querySelectorAll(sel).forEach((el) => {
-            const style = window.getComputedStyle(el);
-            if (!style) return;
-            const pointer = style.pointerEvents;
-            if (pointer && pointer !== 'none') {
-                el.dataset.__seleniumPointerEvents = pointer;
-                el.style.pointerEvents = 'none';
-                handled.push(sel);
-            }
-        });
-    });
-    return handled;
     """
-    try:
-        return driver.execute_script(script, OVERLAY_BLOCKERS) or []
-    except Exception:
+    Overlays are neutralized by the page init script (scraper.page_scripts.INIT_JS)
+    that get_driver/create_driver install, so there's nothing to send per call.
+    Drivers without it (no CDP) get the same rule attached to the current page
+    once; later calls find it by its data attribute and stop there.
+    """
+    if ensure_overlay_guard(driver):
         return []
+    return list(OVERLAY_BLOCKERS)
+
+
+def _first_visible(driver, selector_group: str, timeout: float):
+    """Poll one CSS selector group until a rendered match shows up; None on timeout."""
+    try:
+        return WebDriverWait(driver, timeout, poll_frequency=0.1).until(
+            lambda d: d.execute_script(FIRST_VISIBLE_JS, selector_group)
+        )
+    except TimeoutException:
+        return None
 
 
 def _locate_filter_container(driver, timeout: float = 5.0):
-    for locator in FILTER_CONTAINER_LOCATORS:
-        try:
-            container = WebDriverWait(driver, timeout).until(
-                EC.presence_of_element_located((By.XPATH, locator))
-            )
-            if container and container.is_displayed():
-                return container
-        except Exception:
-            continue
-    return None
+    return _first_visible(driver, FILTER_CONTAINER_UNION, timeout)
 
 
 def _toggle_filters_panel(driver) -> None:
     for locator in FILTER_TOGGLE_LOCATORS:
         try:
-            button = driver.find_element(By.XPATH, locator)
+            button = driver.find_element(*locator)
             if button.is_displayed():
+                # No fixed pause: callers wait for the container itself
                 driver.execute_script("arguments[0].click();", button)
-                time.sleep(0.6)
                 return
         except Exception:
             continue
 
 
-def _find_filter_button(container, label: str):
-    normalized = label.strip().lower()
-    xpaths = [
-        f".//button[contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), '{normalized}')]",
-        f".//div[contains(@role,'option') and contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), '{normalized}')]",
-    ]
-    for xpath in xpaths:
-        try:
-            button = container.find_element(By.XPATH, xpath)
-            if button.is_displayed():
-                return button
-        except NoSuchElementException:
-            continue
-    return None
-
-
 # -------------------------------------------------------------------------
 # 🏠 Property Scraping Core
 # -------------------------------------------------------------------------
 
 def _get_property_cards(driver) -> List[Any]:
-    for selector in CARD_CSS_SELECTORS:
-        cards = driver.find_elements(By.CSS_SELECTOR, selector)
-        cards = [card for card in cards if card.is_displayed()]
-        if cards:
-            return cards
-    cards = driver.find_elements(By.XPATH, CARD_FALLBACK_XPATH)
-    return [card for card in cards if card.is_displayed()]
-
-
-def _extract_address(lines: List[str], card) -> str:
-    for line in lines:
-        if ADDRESS_REGEX.search(line):
-            return line
+    """Visible property cards in one script call (VISIBLE_CARDS_JS)."""
+    return driver.execute_script(VISIBLE_CARDS_JS, CARD_CSS_SELECTORS, CARD_FALLBACK_CSS) or []
+
+
+def _card_snapshot(driver, start: int = 0) -> Dict[str, Any]:
+    """CARD_SNAPSHOT_JS: visible-card count plus {scrId, text, chips, addressHint} for cards[start:]."""
+    return driver.execute_script(CARD_SNAPSHOT_JS, CARD_CSS_SELECTORS, CARD_FALLBACK_CSS, start) or {
+        "total": 0, "start": 0, "cards": []
+    }
+
+
+def parse_card_text(
+    text: str, hint: str = "", chips: Iterable[str] = ()
+) -> Tuple[str, str, str, List[str]]:
+    """
+    (address, owner, value, tags) from a card's innerText in one pass over its
+    lines: the first line matching ADDRESS_REGEX / OWNER_REGEX (or a short
+    title-cased name) / VALUE_REGEX, and every TAG_REGEX line plus new chips.
+    Each field stops being tested once it's found.
+    """
+    address = owner = value = ""
+    tags: List[str] = []
+    for line in text.split("\n"):
+        line = line.strip()
+        if not line:
+            continue
+        if not address and ADDRESS_REGEX.search(line):
+            address = line
+        if not owner and (OWNER_REGEX.search(line) or (line.istitle() and len(line.split()) <= 3)):
+            owner = line
+        if not value and VALUE_REGEX.search(line):
+            value = line
+        if TAG_REGEX.search(line):
+            tags.append(line)
+    if not address and ADDRESS_REGEX.search(hint):
+        address = hint
+    for chip in chips:
+        if chip and chip not in tags:
+            tags.append(chip)
+    return address, owner, value, tags
+
+
+def _retry_stale(fn, *args, tries: int = 3, **kwargs):
+    """Call `fn`, retrying with a short backoff when the DOM re-renders under it."""
+    for attempt in range(1, tries + 1):
+        try:
+            return fn(*args, **kwargs)
+        except StaleElementReferenceException:
+            if attempt == tries:
+                raise
+            time.sleep(0.1 * attempt)
+
+
+def _read_modal(driver, timeout: float = 5) -> Tuple[Any, Dict[str, Any]]:
+    """Wait for the property modal and read its payload in the same script call."""
     try:
-        text = (
-            card.find_element(By.XPATH, ".//*[contains(@class,'address') or contains(text(), ', ')]")
-            .text.strip()
+        return WebDriverWait(driver, timeout, poll_frequency=0.1).until(
+            lambda d: d.execute_script(MODAL_READ_JS, MODAL_UNION)
         )
-        return text if ADDRESS_REGEX.search(text) else ""
-    except NoSuchElementException:
-        return ""
-
-
-def _extract_owner(lines: List[str]) -> str:
-    for line in lines:
-        if any(tag in line for tag in ("LLC", "Trust", "Inc", "Corp", "Properties", "Estates")) or (
-            len(line.split()) <= 3 and line.istitle()
-        ):
-            return line
-    return ""
-
-
-def _extract_value(lines: List[str]) -> str:
-    for line in lines:
-        text = line.lower()
-        if "$" in line or "value" in text or "est." in text:
-            return line
-    return ""
-
-
-def _extract_tags(lines: List[str], card) -> List[str]:
-    tags = [
-        line
-        for line in lines
-        if any(keyword in line.lower() for keyword in ("vacant", "absentee", "lead", "owner occ", "high equity"))
-    ]
-    elements = card.find_elements(
-        By.XPATH, ".//*[contains(@class,'chip') or contains(@class,'tag') or contains(@class,'badge')]"
-    )
-    for element in elements:
-        text = element.text.strip()
-        if text and text not in tags:
-            tags.append(text)
-    return tags
+    except TimeoutException:
+        return None, {}
+
+
+def _close_modal(driver, modal, timeout: float = 2) -> bool:
+    """
+    Click the modal's close button (CSS group first, text-matched buttons only if
+    that misses) and wait for the modal to go away. True once it's gone.
+    """
+    try:
+        close_btn = driver.execute_script(FIRST_VISIBLE_JS, CLOSE_BUTTON_UNION)
+        if close_btn is None:
+            for xpath in CLOSE_BUTTON_XPATHS:
+                close_btn = next((b for b in driver.find_elements(By.XPATH, xpath) if b.is_displayed()), None)
+                if close_btn is not None:
+                    break
+        if close_btn is None:
+            return False
+        driver.execute_script("arguments[0].click();", close_btn)
+    except Exception:
+        return False
+    return _wait_until(driver, EC.invisibility_of_element(modal), timeout)
+
+
+def _force_close_modal(driver, modal, timeout: float = 1) -> bool:
+    """Fallback for _close_modal: send ESC to the focused element and wait briefly."""
+    try:
+        driver.switch_to.active_element.send_keys(Keys.ESCAPE)
+    except Exception:
+        return False
+    return _wait_until(driver, EC.invisibility_of_element(modal), timeout)
 
 
-def _deep_scrape_card(driver, card, address: str, retry_count: int) -> Tuple[Dict[str, Any], int]:
+def _deep_scrape_card(
+    driver, card, address: str, retry_count: int, scr_id: Optional[str] = None
+) -> Tuple[Dict[str, Any], int]:
     """
     Deep scrape a property card by opening its modal and extracting additional details.
+    `card` may be None when `scr_id` is given; the card is then looked up by its
+    data-scr-id inside the page. Locating, clicking, waiting for the modal and
+    reading it all happen in one async script call (OPEN_CARD_JS); a stale
+    `card` handle is retried via its data-scr-id when one is given.
     Returns a tuple of (scraped_data_dict, retry_count).
     """
+    target = [card]
+
+    def _open_card() -> Optional[List[Any]]:
+        card_ref = target[0] if target[0] is not None else CARD_BY_ID_CSS.format(scr_id)
+        try:
+            opened = driver.execute_async_script(OPEN_CARD_JS, card_ref, MODAL_UNION, 5000)
+        except StaleElementReferenceException:
+            if scr_id:
+                target[0] = None
+            raise
+        if opened is False:
+            raise NoSuchElementException(f"card {scr_id} left the DOM")
+        return opened
+
     try:
-        driver.execute_script("arguments[0].scrollIntoView({block:'center'});", card)
-        driver.execute_script("arguments[0].click();", card)
-        time.sleep(1.5)
-        
-        # Wait for modal to appear
-        modal = None
-        for locator in MODAL_LOCATORS:
-            try:
-                modal = WebDriverWait(driver, 5).until(
-                    EC.presence_of_element_located((By.XPATH, locator))
-                )
-                if modal and modal.is_displayed():
-                    break
-            except Exception:
-                continue
-        
+        # Scroll, click and wait for the modal in one call; it comes back with its content
+        opened = _retry_stale(_open_card)
+        # Fallback: a short client-side poll in case the observer missed it
+        modal, payload = opened if opened else _read_modal(driver, timeout=1)
         if not modal:
             return {}, retry_count
-        
-        # Extract modal content
-        modal_text = modal.text.strip()
-        lines = [ln.strip() for ln in modal_text.split("\n") if ln.strip()]
-        
+        modal_text = payload.get("text", "").strip()
+        _, owner, value, tags = parse_card_text(modal_text, chips=payload.get("chips", ()))
+
         data = {
             "Property Address": address,
-            "Owner Name": _extract_owner(lines),
-            "Estimated Value": _extract_value(lines),
-            "Status": ", ".join(_extract_tags(lines, modal)),
+            "Owner Name": owner,
+            "Estimated Value": value,
+            "Status": ", ".join(tags),
         }
         
-        # Close modal
-        for locator in CLOSE_BUTTON_LOCATORS:
-            try:
-                close_btn = driver.find_element(By.XPATH, locator)
-                if close_btn.is_displayed():
-                    driver.execute_script("arguments[0].click();", close_btn)
-                    time.sleep(0.5)
-                    break
-            except Exception:
-                continue
-        
+        # One wait inside _close_modal; ESC straight away if that didn't work
+        if not _close_modal(driver, modal):
+            _force_close_modal(driver, modal)
+
         return data, retry_count
         
     except Exception as e:
@@ -311,6 +544,52 @@ def _deep_scrape_card(driver, card, address: str, retry_count: int) -> Tuple[Dic
         return {}, retry_count
 
 
+def _json_line(obj: Any) -> bytes:
+    """One compact JSON document (no trailing newline)."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=str)
+    return json.dumps(obj, default=str, ensure_ascii=False).encode("utf-8")
+
+
+def _json_pretty(obj: Any) -> str:
+    if orjson is not None:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(obj, indent=2, default=str)
+
+
+# -------------------------------------------------------------------------
+# 🧮 Address De-duplication
+# -------------------------------------------------------------------------
+
+def _address_key(address: str) -> int:
+    """64-bit key for an address; a fraction of the string's memory in the seen set."""
+    data = address.encode("utf-8")
+    if xxhash is not None:
+        return xxhash.xxh64_intdigest(data)
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "little")
+
+
+def _read_seen_hashes() -> set:
+    hashes = array("Q")
+    try:
+        with SEEN_HASHES_PATH.open("rb") as fh:
+            hashes.frombytes(fh.read())
+    except (OSError, ValueError):
+        return set()
+    return set(hashes)
+
+
+def _save_seen_hashes(hashes: set) -> None:
+    """Merge `hashes` into SEEN_HASHES_PATH (other workers may have added some meanwhile)."""
+    with _SEEN_HASHES_LOCK:
+        merged = _read_seen_hashes() | hashes
+        SEEN_HASHES_PATH.parent.mkdir(parents=True, exist_ok=True)
+        tmp = SEEN_HASHES_PATH.with_suffix(".tmp")
+        with tmp.open("wb") as fh:
+            array("Q", merged).tofile(fh)
+        os.replace(tmp, SEEN_HASHES_PATH)
+
+
 # -------------------------------------------------------------------------
 # 💾 Airtable Upload Layer
 # -------------------------------------------------------------------------
@@ -323,7 +602,7 @@ def save_property_to_airtable(scraped_record: Dict[str, Any]) -> None:
     try:
         result = route_and_upload(scraped_record)
         if isinstance(result, dict):
-            print(f"📤 Upload result: {json.dumps(result, indent=2)}")
+            print(f"📤 Upload result: {_json_line(result).decode()}")
         else:
             print(f"📤 Upload complete: {result}")
     except Exception as e:
@@ -340,19 +619,80 @@ def upload_all_properties(properties: List[Dict[str, Any]], delay: float = 0.4)
     print(f"🚀 Starting batch upload for {total} records...")
     uploaded, failed = 0, 0
 
-    for i, record in enumerate(properties, 1):
+    # 10 records per Airtable POST; the delay is now paid per chunk, not per record
+    records = iter(properties)
+    for start in range(0, total, AIRTABLE_BATCH_SIZE):
+        chunk = list(islice(records, AIRTABLE_BATCH_SIZE))
         try:
-            save_property_to_airtable(record)
-            uploaded += 1
+            for result in route_and_upload_batch(chunk):
+                if any(result.values()):
+                    uploaded += 1
+                else:
+                    failed += 1
         except Exception as exc:
-            print(f"⚠️ Upload error for record #{i}: {exc}")
-            failed += 1
+            print(f"⚠️ Upload error for records #{start + 1}-{start + len(chunk)}: {exc}")
+            failed += len(chunk)
 
         time.sleep(delay)
 
     print(f"✅ Upload Summary → Uploaded: {uploaded} | Failed: {failed}")
 
 
+def _airtable_worker(
+    upload_q: "queue.Queue[Optional[Tuple[int, Dict[str, Any]]]]",
+    stats: Dict[str, int],
+    uploaded_keys: set,
+) -> None:
+    """
+    Background uploader for scroll_and_scrape_properties: drains `upload_q` of
+    (address key, record) pairs in chunks of up to AIRTABLE_BATCH_SIZE and sends
+    each through route_and_upload_batch until it reads the None sentinel. Keys
+    of records that reached at least one table are added to `uploaded_keys`.
+    """
+    done = False
+    while not done:
+        chunk = []
+        record = upload_q.get()
+        while True:
+            if record is None:
+                done = True
+                break
+            chunk.append(record)
+            if len(chunk) >= AIRTABLE_BATCH_SIZE:
+                break
+            try:
+                record = upload_q.get_nowait()
+            except queue.Empty:
+                break
+        if not chunk:
+            continue
+        try:
+            results = route_and_upload_batch([record for _, record in chunk])
+            for (key, _), result in zip(chunk, results):
+                if any(result.values()):
+                    stats["uploaded"] += 1
+                    uploaded_keys.add(key)
+                else:
+                    stats["failed"] += 1
+        except Exception as exc:
+            print(f"⚠️ Upload error for {len(chunk)} streamed records: {exc}")
+            stats["failed"] += len(chunk)
+
+
+def _export_records(records: List[Dict[str, Any]], path: Path) -> None:
+    """Write `records` as pretty JSON or CSV when `path` asks for it (.json / .csv)."""
+    try:
+        if path.suffix == ".json":
+            path.write_text(_json_pretty(records), encoding="utf-8")
+        elif path.suffix == ".csv":
+            with path.open("w", newline="", encoding="utf-8") as fh:
+                writer = csv.DictWriter(fh, fieldnames=RECORD_FIELDS, extrasaction="ignore")
+                writer.writeheader()
+                writer.writerows(records)
+    except OSError as e:
+        print(f"⚠️ Could not export records to {path}: {e}")
+
+
 # -------------------------------------------------------------------------
 # 🔁 Scraper Execution
 # -------------------------------------------------------------------------
@@ -365,27 +705,43 @@ def scroll_and_scrape_properties(
     auto_filters: bool = True,
     modal_limit: int = 250,           # Higher modal cap
     restart_callback=None,
-    save_path: str = "data/scraped_properties.json",
+    save_path: str = "data/scraped_properties.jsonl",
     auto_quit: bool = False,
     source_zip: Optional[str] = None,
+    persist_seen: bool = False,
+    record_filter: Optional[Callable[[Dict[str, Any]], bool]] = None,
 ) -> List[Dict[str, Any]]:
     """
     ⚡️ High-Yield Mode:
     Adaptive scrolling + deduplication for massive property extraction.
+    With `persist_seen`, addresses uploaded by earlier runs (SEEN_HASHES_PATH)
+    are skipped too, and this run's successful uploads are added to the file.
+    Records are streamed to Airtable by a background uploader while scrolling
+    continues; it's drained before this returns. Each record is also appended
+    to the .jsonl next to `save_path` as it's scraped; a `.json` or `.csv`
+    save_path additionally gets this run's records consolidated at the end.
+    `record_filter`, when given, sees each finished record first; records it
+    rejects are neither saved, uploaded nor returned.
     """
 
-    from airtable_utils.router import batch_upload  # <-- unified router integration
-
     print("🚀 [High-Yield Mode] Starting extended property scraping sequence...")
     properties: List[Dict[str, Any]] = []
-    seen_addresses = set()
-    output_path = Path(save_path)
+    seen_hashes: set = _read_seen_hashes() if persist_seen else set()
+    output_path = Path(save_path).with_suffix(".jsonl")
     output_path.parent.mkdir(parents=True, exist_ok=True)
-
-    def _persist_batch(records: List[Dict[str, Any]]) -> None:
-        if not records:
-            return
-        output_path.write_text(json.dumps(records, indent=2, default=str), encoding="utf-8")
+    # One append-only handle for the whole run, flushed after every pass
+    output = output_path.open("ab")
+
+    # ✅ Upload to Airtable via the unified router as records are scraped
+    upload_q: "queue.Queue[Optional[Tuple[int, Dict[str, Any]]]]" = queue.Queue()
+    upload_stats = {"uploaded": 0, "failed": 0}
+    # Only addresses that actually reached Airtable are persisted as seen, so a
+    # failed upload is retried by the next cycle
+    uploaded_keys: set = set()
+    uploader = threading.Thread(
+        target=_airtable_worker, args=(upload_q, upload_stats, uploaded_keys), daemon=True
+    )
+    uploader.start()
 
     try:
         if auto_filters:
@@ -397,10 +753,13 @@ def scroll_and_scrape_properties(
         stable_count = 0
         last_total = 0
         modal_scraped = 0
+        processed = 0  # cards already read; the list only grows while scrolling
 
         for scroll_index in range(max_scrolls):
-            cards = _get_property_cards(driver)
-            current_total = len(cards)
+            # Count and new-card text in one script call; Selenium element
+            # handles are only fetched for cards that get deep-scraped
+            snapshot = _card_snapshot(driver, processed)
+            current_total = snapshot["total"]
             print(f"📍 Scroll {scroll_index+1}: {current_total} cards visible.")
 
             # Stop when no new cards appear twice in a row
@@ -413,21 +772,26 @@ def scroll_and_scrape_properties(
                 stable_count = 0
             last_total = current_total
 
-            for card in cards:
+            # Only cards appended since the last pass were read; if the list
+            # shrank (re-rendered), the snapshot restarted at 0 and seen_hashes
+            # drops the repeats
+            processed = current_total
+            for payload in snapshot["cards"]:
                 try:
-                    card_text = card.text.strip()
+                    card_text = payload["text"].strip()
                     if not card_text:
                         continue
-                    lines = [ln.strip() for ln in card_text.split("\n") if ln.strip()]
-                    address = _extract_address(lines, card)
-                    owner = _extract_owner(lines)
-                    value = _extract_value(lines)
-                    tags = _extract_tags(lines, card)
+                    address, owner, value, tags = parse_card_text(
+                        card_text, payload["addressHint"], payload["chips"]
+                    )
 
                     # Skip duplicates
-                    if not address or address in seen_addresses:
+                    if not address:
+                        continue
+                    key = _address_key(address)
+                    if key in seen_hashes:
                         continue
-                    seen_addresses.add(address)
+                    seen_hashes.add(key)
 
                     record = {
                         "Property Address": address or "",
@@ -439,40 +803,55 @@ def scroll_and_scrape_properties(
 
                     # Optional deep modal scrape
                     if deep_scrape and modal_scraped < modal_limit:
-                        layered, _ = _deep_scrape_card(driver, card, address, 0)
+                        layered, _ = _deep_scrape_card(driver, None, address, 0, payload["scrId"])
                         modal_scraped += 1
                         if layered:
                             record.update({k: layered.get(k, record.get(k, "")) for k in layered})
 
+                    if record_filter is not None and not record_filter(record):
+                        continue
+
                     properties.append(record)
+                    output.write(_json_line(record) + b"\n")
+                    upload_q.put((key, record))
 
                 except Exception as e:
                     print(f"⚠️ Error parsing card: {e}")
                     continue
 
-            # Scroll sidebar dynamically
-            driver.execute_script(
-                "const sidebar=document.querySelector('.deal-scroll');"
-                "if(sidebar){sidebar.scrollBy(0, sidebar.scrollHeight);}"
-            )
-            time.sleep(wait_time)
+            output.flush()
+
+            # Scroll sidebar dynamically; the page signals (up to wait_time) once it grows
+            grew = driver.execute_async_script(SCROLL_AND_WAIT_JS, int(wait_time * 1000))
+            if grew is None:
+                time.sleep(wait_time)
 
         # --- POST-SCRAPE PHASE ---
         cleaned = [p for p in properties if isinstance(p, dict) and any(p.values())]
         print(f"✅ [High-Yield] Scraped {len(cleaned)} unique property records.")
         if cleaned:
-            print(f"🧠 Sample record:\n{json.dumps(cleaned[0], indent=2)}")
-
-            # ✅ Upload all to Airtable via the unified router
-            print("📦 Uploading scraped properties to Airtable...")
-            batch_upload(cleaned)  # auto-routes to correct bases
+            print(f"🧠 Sample record:\n{_json_pretty(cleaned[0])}")
         else:
             print("⚠️ No valid property data scraped.")
 
         return cleaned
 
     finally:
-        _persist_batch(properties)
+        output.close()
+        if properties:
+            _export_records(properties, Path(save_path))
+        # Let the uploader finish what was queued (also after a mid-scrape failure)
+        upload_q.put(None)
+        uploader.join()
+        if properties:
+            print(
+                f"📦 Airtable upload → Uploaded: {upload_stats['uploaded']} | Failed: {upload_stats['failed']}"
+            )
+        if persist_seen:
+            try:
+                _save_seen_hashes(uploaded_keys)
+            except OSError as e:
+                print(f"⚠️ Could not save seen addresses: {e}")
         if auto_quit:
             try:
                 driver.quit()
@@ -9,6 +9,10 @@ from selenium.common.exceptions import (
 )
 import time
 
+# Same cards scraper_core reads (PROPERTY_CARD_SELECTOR), as CSS
+PROPERTY_CARD_CSS = ".deal-scroll .deal-wrapper, .deal-scroll .property-card"
+
+
 def search_zip(driver, zip_code):
     print(f"\n🔍 Searching ZIP: {zip_code}")
     zip_code = str(zip_code).strip()
@@ -17,8 +21,8 @@ def search_zip(driver, zip_code):
         try:
             WebDriverWait(driver, 10).until_not(
                 EC.presence_of_element_located((
-                    By.XPATH,
-                    "//div[contains(@style,'position: fixed') and contains(@style,'width: 100%')]"
+                    By.CSS_SELECTOR,
+                    "div[style*='position: fixed'][style*='width: 100%']"
                 ))
             )
             print("🧹 Overlay cleared, ready to click")
@@ -28,11 +32,10 @@ def search_zip(driver, zip_code):
     # --- Clear any old search filters or overlays ---
     try:
         clear_buttons = driver.find_elements(
-            By.XPATH, "//button[contains(@aria-label,'clear') or contains(@class,'clear')]"
+            By.CSS_SELECTOR, "button[aria-label*='clear'], button[class*='clear']"
         )
         for b in clear_buttons:
             driver.execute_script("arguments[0].click();", b)
-            time.sleep(0.3)
     except Exception:
         pass
 
@@ -42,13 +45,13 @@ def search_zip(driver, zip_code):
     # --- Find search input field ---
     search_input = None
     for selector in [
-        '//input[contains(@placeholder, "Search")]',
-        '//input[@type="search"]',
-        '//input[@role="searchbox"]'
+        'input[placeholder*="Search"]',
+        'input[type="search"]',
+        'input[role="searchbox"]'
     ]:
         try:
             search_input = WebDriverWait(driver, 10).until(
-                EC.element_to_be_clickable((By.XPATH, selector))
+                EC.element_to_be_clickable((By.CSS_SELECTOR, selector))
             )
             break
         except TimeoutException:
@@ -62,7 +65,13 @@ def search_zip(driver, zip_code):
     wait_for_overlay_to_clear()
     driver.execute_script("arguments[0].scrollIntoView({block:'center'});", search_input)
     driver.execute_script("arguments[0].click();", search_input)
-    time.sleep(0.3)
+    # Type as soon as the input has focus instead of after a fixed pause
+    try:
+        WebDriverWait(driver, 2, poll_frequency=0.05).until(
+            lambda d: d.execute_script("return document.activeElement === arguments[0];", search_input)
+        )
+    except TimeoutException:
+        pass
     search_input.send_keys(Keys.CONTROL, 'a')
     search_input.send_keys(Keys.BACKSPACE)
     search_input.send_keys(zip_code)
@@ -80,7 +89,6 @@ def search_zip(driver, zip_code):
                 EC.element_to_be_clickable((By.XPATH, suggestion_xpath))
             )
             driver.execute_script("arguments[0].scrollIntoView({block:'center'});", suggestion)
-            time.sleep(0.25)
             suggestion.click()
             print(f"🖱️ Clicked dropdown suggestion for {zip_code}")
             break
@@ -98,10 +106,9 @@ def search_zip(driver, zip_code):
     wait_for_overlay_to_clear()
 
     # --- Wait for property cards sidebar ---
-    sidebar_selector = "//div[contains(@class,'deal-scroll')]//div[contains(@class,'deal-wrapper') or contains(@class,'property-card')]"
     try:
         WebDriverWait(driver, 25).until(
-            EC.presence_of_element_located((By.XPATH, sidebar_selector))
+            EC.presence_of_element_located((By.CSS_SELECTOR, PROPERTY_CARD_CSS))
         )
         print(f"✅ Properties loaded for ZIP {zip_code}")
         return True